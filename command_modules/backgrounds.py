@@ -0,0 +1,52 @@
+#backgrounds.py
+from __future__ import annotations
+
+import os
+
+from PIL import Image
+
+BACKGROUND_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# (path, size) -> (mtime, decoded RGBA image)
+_IMAGES: dict[tuple[str, tuple[int, int] | None], tuple[float, Image.Image]] = {}
+
+
+def find_village_background(village: str) -> str | None:
+    """``<village>.png/.jpg/.jpeg`` in the working directory, first match wins."""
+    safe_village = village.strip().replace("__", "_")
+    for ext in BACKGROUND_EXTENSIONS:
+        path = os.path.join(os.getcwd(), safe_village + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def image_version(path: str | None) -> tuple[str | None, float | None]:
+    """``(path, mtime)``; changes whenever the file is replaced or edited."""
+    if path is None:
+        return None, None
+    try:
+        return path, os.path.getmtime(path)
+    except OSError:
+        return path, None
+
+
+def load_image(path: str, size: tuple[int, int] | None = None) -> Image.Image | None:
+    """``path`` decoded to RGBA and, if ``size`` is given, scaled to it.
+
+    Decoding and scaling happen once per file version; later calls return the
+    cached image until the file's mtime changes. Callers must not modify it.
+    """
+    _, mtime = image_version(path)
+    if mtime is None:
+        return None
+    key = (path, size)
+    cached = _IMAGES.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with Image.open(path) as source:
+        image = source.convert("RGBA")
+    if size is not None and image.size != size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    _IMAGES[key] = (mtime, image)
+    return image
@@ -48,7 +48,9 @@ def register_commands(
         interaction: discord.Interaction,
         color: str = "",
         village: str = "Dogville",
-        seconds: int = 7
+        seconds: int = 7,
+        deep: bool = False,
+        batch: bool = False
     ):
         if seconds < 1 or seconds > 500:
             await interaction.response.send_message(
@@ -62,7 +64,9 @@ def register_commands(
             color,
             village,
             seconds,
-            points_deps
+            points_deps,
+            deep,
+            batch
         )
     @cook.autocomplete("color")
     async def cook_color_autocomplete(interaction: discord.Interaction, current: str):
@@ -0,0 +1,17 @@
+#__init__.py
+from .solver import SOLVER_VERSION, solve_route
+from .pool import (
+    cook_route,
+    cook_route_batch,
+    cook_route_deep,
+    cook_route_parallel,
+    get_cook_pool,
+    open_cook_channel,
+    run_in_cook_pool,
+    shutdown_cook_pool,
+)
+from .route_store import RouteStore, point_set_key
+from .genetic import DEEP_MIN_SECONDS
+from .progress import ProgressReporter
+from .jobs import CookJob, CookJobs, CookQueueFull
+from .precook import PreCooker
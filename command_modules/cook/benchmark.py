@@ -0,0 +1,129 @@
+#benchmark.py
+"""Calibrate the ``solver.POLICY`` table: ``python -m command_modules.cook.benchmark``.
+
+Every strategy cooks the same random villages at several sizes and budgets.
+The winner of a cell is the fastest strategy whose route is within
+``TOLERANCE`` of the best route any strategy found there. The printed
+``POLICY`` can be pasted into ``solver.py``.
+"""
+
+import argparse
+import random
+
+from command_modules.cook.geometry import WORLD_SIZE
+from command_modules.cook.solver import STRATEGIES, solve_route
+
+SIZES = (20, 40, 80, 150, 300, 600)
+BUDGETS = (1, 3, 10)
+TOLERANCE = 0.005
+# Villages per cell; a strategy must be good on all of them.
+REPEATS = 3
+
+
+def random_village(count: int, seed: int) -> list[tuple[float, float]]:
+    """Half the pearls in a few clusters, half scattered, like a mapped village."""
+    rng = random.Random(seed)
+    centers = [
+        (rng.uniform(-WORLD_SIZE, WORLD_SIZE) * 0.8, rng.uniform(-WORLD_SIZE, WORLD_SIZE) * 0.8)
+        for _ in range(4)
+    ]
+    coords = []
+    for index in range(count):
+        if index % 2:
+            cx, cy = rng.choice(centers)
+            coords.append((cx + rng.gauss(0, 12), cy + rng.gauss(0, 12)))
+        else:
+            coords.append((rng.uniform(-WORLD_SIZE, WORLD_SIZE), rng.uniform(-WORLD_SIZE, WORLD_SIZE)))
+    return coords
+
+
+def run(sizes, budgets, repeats: int) -> list[tuple[int, float, str]]:
+    """Print one line per cell and return ``(size, budget, winner)`` rows.
+
+    A strategy counts as good in a cell only if it is within ``TOLERANCE`` on
+    every repeat; among good ones, near-ties on time go to the shorter routes.
+    """
+    strategies = [name for name in STRATEGIES if name != "exact"]
+    winners = []
+    for size in sizes:
+        villages = [random_village(size, seed=size * 100 + repeat) for repeat in range(repeats)]
+        for budget in budgets:
+            cost = dict.fromkeys(strategies, 0.0)
+            elapsed = dict.fromkeys(strategies, 0.0)
+            good = set(strategies)
+            for coords in villages:
+                results = {name: solve_route(coords, budget, strategy=name) for name in strategies}
+                best = min(result["cost"] for result in results.values())
+                for name, result in results.items():
+                    cost[name] += result["cost"]
+                    elapsed[name] += result["stats"]["elapsed"]
+                    if result["cost"] > best * (1 + TOLERANCE):
+                        good.discard(name)
+
+            if not good:
+                good = {min(strategies, key=cost.__getitem__)}
+            fastest = min(elapsed[name] for name in good)
+            tied = [name for name in good if elapsed[name] <= fastest * 1.1 + 0.05 * repeats]
+            winner = min(tied, key=cost.__getitem__)
+            winners.append((size, budget, winner))
+            summary = "  ".join(
+                f"{name}={cost[name] / repeats:.0f}/{elapsed[name] / repeats:.1f}s" for name in strategies
+            )
+            print(f"{size:>5} pts {budget:>4g}s  {summary}  -> {winner}", flush=True)
+    return winners
+
+
+def policy_rules(winners: list[tuple[int, float, str]]) -> list[tuple[str, int, float]]:
+    """Collapse the winner grid into first-match ``(strategy, max points, max s/pt)`` rules."""
+    rules: list[tuple[str, int, float]] = []
+    previous_row: list[tuple[str, int, float]] = []
+    for size in sorted({size for size, _, _ in winners}):
+        row: list[tuple[str, int, float]] = []
+        cells = sorted((budget, winner) for cell_size, budget, winner in winners if cell_size == size)
+        for index, (budget, winner) in enumerate(cells):
+            limit = float("inf") if index == len(cells) - 1 else budget / size
+            if row and row[-1][0] == winner:
+                row[-1] = (winner, size, limit)
+            else:
+                row.append((winner, size, limit))
+        if len(row) == 1 and len(previous_row) == 1 and previous_row[0][0] == row[0][0]:
+            # A single strategy across both sizes: widen the previous rule instead.
+            rules[-1] = row[0]
+        else:
+            rules.extend(row)
+        previous_row = row
+    return merge_rules(rules)
+
+
+def merge_rules(rules: list[tuple[str, int, float]]) -> list[tuple[str, int, float]]:
+    """Drop a rule the next one covers with the same strategy; first-match results are unchanged."""
+    merged: list[tuple[str, int, float]] = []
+    for rule in rules:
+        while (
+            merged
+            and merged[-1][0] == rule[0]
+            and merged[-1][1] <= rule[1]
+            and merged[-1][2] <= rule[2]
+        ):
+            merged.pop()
+        merged.append(rule)
+    return merged
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--budgets", type=float, nargs="+", default=list(BUDGETS))
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+
+    rules = policy_rules(run(args.sizes, args.budgets, args.repeats))
+    print("\nPOLICY = (")
+    for strategy, max_points, max_budget in rules:
+        limit = 'float("inf")' if max_budget == float("inf") else f"{max_budget:.4g}"
+        print(f'    ("{strategy}", {max_points}, {limit}),')
+    print(")")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#construction.py
+from __future__ import annotations
+
+import math
+
+from command_modules.cook.geometry import POINTS_PER_CELL, WORLD_SIZE, Geometry
+
+# Hilbert curve resolution: the world square is split into 2**HILBERT_ORDER cells per side.
+HILBERT_ORDER = 16
+
+
+class _PointGrid:
+    """Uniform grid over a shrinking set of points, for nearest-remaining lookups."""
+
+    def __init__(self, coords: list[tuple[float, float]], members):
+        self.coords = coords
+        members = list(members)
+        self.cells_per_side = max(1, int((len(members) / POINTS_PER_CELL) ** 0.5))
+        self.cell_size = (WORLD_SIZE * 2) / self.cells_per_side
+        self.buckets: dict[tuple[int, int], set[int]] = {}
+        self.size = 0
+        for index in members:
+            self.buckets.setdefault(self._cell(*coords[index]), set()).add(index)
+            self.size += 1
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        last = self.cells_per_side - 1
+        return (
+            min(last, max(0, int((x + WORLD_SIZE) // self.cell_size))),
+            min(last, max(0, int((y + WORLD_SIZE) // self.cell_size))),
+        )
+
+    def remove(self, index: int) -> None:
+        bucket = self.buckets.get(self._cell(*self.coords[index]))
+        if bucket is not None and index in bucket:
+            bucket.remove(index)
+            self.size -= 1
+
+    def nearest(self, x: float, y: float) -> int | None:
+        """Closest remaining point to ``(x, y)``, searching ring by ring outwards."""
+        if not self.size:
+            return None
+        cell_x, cell_y = self._cell(x, y)
+        coords = self.coords
+        best = None
+        best_dist = math.inf
+        ring = 0
+        while True:
+            for grid_x in range(cell_x - ring, cell_x + ring + 1):
+                edge_x = grid_x in (cell_x - ring, cell_x + ring)
+                step = 1 if edge_x else 2 * ring
+                for grid_y in range(cell_y - ring, cell_y + ring + 1, max(1, step)):
+                    for index in self.buckets.get((grid_x, grid_y), ()):
+                        px, py = coords[index]
+                        d = math.hypot(px - x, py - y)
+                        if d < best_dist:
+                            best_dist = d
+                            best = index
+            # Anything in the next ring is at least ``ring * cell_size`` away.
+            if best is not None and best_dist <= ring * self.cell_size:
+                return best
+            if ring > self.cells_per_side:
+                return best
+            ring += 1
+
+
+def nearest_neighbor(geo: Geometry, start: int, time_up) -> list[int]:
+    """Greedy walk to the closest unvisited point.
+
+    The first unvisited entry of a node's candidate list is its nearest
+    unvisited point; only when all candidates are used does the grid search run.
+    """
+    if not geo.count:
+        return []
+
+    coords = geo.coords
+    neighbors = geo.neighbors
+    grid = _PointGrid(coords, range(geo.count))
+    visited = [False] * geo.count
+    route = [start]
+    visited[start] = True
+    grid.remove(start)
+
+    while grid.size and not time_up():
+        current = route[-1]
+        nxt = None
+        for candidate in neighbors[current]:
+            if not visited[candidate]:
+                nxt = candidate
+                break
+        if nxt is None:
+            nxt = grid.nearest(*coords[current])
+        route.append(nxt)
+        visited[nxt] = True
+        grid.remove(nxt)
+
+    # A route cut short by the deadline still has to visit every point.
+    route.extend(_curve_order(coords, [index for index in range(geo.count) if not visited[index]]))
+    return route
+
+
+def cheapest_insertion(geo: Geometry, time_up) -> list[int]:
+    count = geo.count
+    if count < 2:
+        return list(range(count))
+
+    dist = geo.dist
+    unvisited = set(range(count))
+    first = unvisited.pop()
+    second = unvisited.pop()
+    route = [first, second]
+
+    while unvisited and not time_up():
+        best_city = None
+        best_pos = 0
+        best_delta = float("inf")
+
+        for city in unvisited:
+            row = dist[city]
+            for i in range(len(route)):
+                j = (i + 1) % len(route)
+                a = route[i]
+                b = route[j]
+                delta = row[a] + row[b] - dist[a][b]
+
+                if delta < best_delta:
+                    best_delta = delta
+                    best_city = city
+                    best_pos = j
+
+        if best_city is None:
+            break
+
+        route.insert(best_pos, best_city)
+        unvisited.remove(best_city)
+
+    route.extend(_curve_order(geo.coords, list(unvisited)))
+    return route
+
+
+def hilbert_index(x: int, y: int, order: int = HILBERT_ORDER) -> int:
+    """Position of cell ``(x, y)`` along a Hilbert curve over a ``2**order`` square."""
+    index = 0
+    side = 1 << (order - 1)
+    while side:
+        rx = 1 if x & side else 0
+        ry = 1 if y & side else 0
+        index += side * side * ((3 * rx) ^ ry)
+        if not ry:
+            if rx:
+                x = side * 2 - 1 - x
+                y = side * 2 - 1 - y
+            x, y = y, x
+        side >>= 1
+    return index
+
+
+def _curve_order(coords: list[tuple[float, float]], indices: list[int]) -> list[int]:
+    cells = (1 << HILBERT_ORDER) - 1
+    scale = cells / (WORLD_SIZE * 2)
+
+    def key(index: int) -> int:
+        x, y = coords[index]
+        cell_x = min(cells, max(0, int((x + WORLD_SIZE) * scale)))
+        cell_y = min(cells, max(0, int((y + WORLD_SIZE) * scale)))
+        return hilbert_index(cell_x, cell_y)
+
+    return sorted(indices, key=key)
+
+
+def greedy_edge(geo: Geometry) -> list[int]:
+    """Build the tour from the shortest candidate edges first.
+
+    An edge is taken when both ends still have degree < 2 and it does not
+    close a cycle. The resulting paths are then chained end to nearest end.
+    """
+    count = geo.count
+    if count < 3:
+        return list(range(count))
+
+    dist = geo.dist
+    edges = sorted(
+        (dist[a][b], a, b)
+        for a in range(count)
+        for b in geo.neighbors[a]
+        if a < b or a not in geo.neighbors[b]
+    )
+
+    parent = list(range(count))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    links: list[list[int]] = [[] for _ in range(count)]
+    taken = 0
+    for _, a, b in edges:
+        if len(links[a]) == 2 or len(links[b]) == 2:
+            continue
+        root_a = find(a)
+        root_b = find(b)
+        if root_a == root_b:
+            continue
+        parent[root_a] = root_b
+        links[a].append(b)
+        links[b].append(a)
+        taken += 1
+        if taken == count - 1:
+            break
+
+    def walk(end: int) -> list[int]:
+        path = [end]
+        previous = -1
+        node = end
+        while True:
+            following = [other for other in links[node] if other != previous]
+            if not following:
+                return path
+            previous, node = node, following[0]
+            path.append(node)
+
+    ends = [node for node in range(count) if len(links[node]) < 2]
+    grid = _PointGrid(geo.coords, ends)
+    route: list[int] = []
+    current = ends[0]
+    while current is not None:
+        path = walk(current)
+        grid.remove(path[0])
+        grid.remove(path[-1])
+        route.extend(path)
+        current = grid.nearest(*geo.coords[path[-1]])
+    return route
@@ -0,0 +1,155 @@
+#convergence.py
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from command_modules.cook.geometry import Geometry
+from command_modules.cook.progress import ProgressReporter
+
+# Default stall window as a share of the budget, clamped to these bounds (seconds).
+STALL_SHARE = 0.3
+STALL_MIN_SECONDS = 2.0
+STALL_MAX_SECONDS = 30.0
+
+# The 1-tree bound needs an O(n^2) tree per iteration, so it is skipped on big villages.
+BOUND_MAX_POINTS = 400
+BOUND_ITERATIONS = 100
+# Share of the budget the bound may take.
+BOUND_SHARE = 0.1
+
+
+def default_stall_window(time_limit: float) -> float:
+    return min(STALL_MAX_SECONDS, max(STALL_MIN_SECONDS, time_limit * STALL_SHARE))
+
+
+class ConvergenceMonitor:
+    """Decides when a solve should stop: deadline, plateau, optimality gap, or a user stop.
+
+    Strategies call ``improved`` whenever their best tour gets shorter and poll
+    ``time_up``; once it returns True, ``reason`` says why. An optional
+    ``reporter`` is handed every new best tour and asked about stop requests.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        stall_window: float | None,
+        lower_bound: float | None = None,
+        target_gap: float | None = None,
+        reporter: ProgressReporter | None = None,
+    ):
+        self.deadline = deadline
+        self.stall_window = stall_window
+        self.lower_bound = lower_bound
+        self.target_gap = target_gap
+        self.reporter = reporter
+        self.best_cost = float("inf")
+        self.last_improvement = time.perf_counter()
+        self.reason: str | None = None
+
+    def improved(self, cost: float, route: list[int] | None = None) -> None:
+        if cost < self.best_cost:
+            self.best_cost = cost
+            self.last_improvement = time.perf_counter()
+            if route is not None and self.reporter is not None:
+                self.reporter.report(route, cost)
+
+    def gap(self) -> float | None:
+        if not self.lower_bound or self.best_cost == float("inf"):
+            return None
+        return max(0.0, (self.best_cost - self.lower_bound) / self.lower_bound)
+
+    def time_up(self) -> bool:
+        if self.reason is not None:
+            return True
+        now = time.perf_counter()
+        if now > self.deadline:
+            self.reason = "deadline"
+        elif self.reporter is not None and self.reporter.stop_requested():
+            self.reason = "stopped"
+        elif self.stall_window is not None and now - self.last_improvement > self.stall_window:
+            self.reason = "stalled"
+        elif self.target_gap is not None:
+            gap = self.gap()
+            if gap is not None and gap <= self.target_gap:
+                self.reason = "gap"
+        return self.reason is not None
+
+    @property
+    def converged(self) -> bool:
+        return self.reason in ("stalled", "gap")
+
+
+def _one_tree(weights: np.ndarray) -> tuple[float, np.ndarray]:
+    """Minimum 1-tree: an MST over nodes 1..n-1 plus node 0's two cheapest edges."""
+    count = weights.shape[0]
+    degree = np.zeros(count, dtype=np.int64)
+    in_tree = np.zeros(count, dtype=bool)
+    in_tree[0] = True
+    in_tree[1] = True
+    key = weights[1].copy()
+    parent = np.full(count, 1, dtype=np.int64)
+    key[0] = np.inf
+    key[1] = np.inf
+    total = 0.0
+
+    for _ in range(count - 2):
+        node = int(np.argmin(np.where(in_tree, np.inf, key)))
+        total += key[node]
+        degree[node] += 1
+        degree[parent[node]] += 1
+        in_tree[node] = True
+        closer = weights[node] < key
+        key = np.where(closer, weights[node], key)
+        parent = np.where(closer, node, parent)
+
+    cheapest = np.argsort(weights[0, 1:])[:2] + 1
+    total += float(weights[0, cheapest].sum())
+    degree[0] += 2
+    degree[cheapest] += 1
+    return total, degree
+
+
+def held_karp_bound(
+    geo: Geometry,
+    upper_bound: float,
+    time_up,
+    iterations: int = BOUND_ITERATIONS,
+) -> float | None:
+    """Lower bound on the tour length from subgradient-optimised 1-trees."""
+    count = geo.count
+    if count < 5:
+        return None
+
+    matrix = geo.matrix
+    penalty = np.zeros(count)
+    best = 0.0
+    step_scale = 2.0
+    stale = 0
+
+    for _ in range(iterations):
+        if time_up():
+            break
+        weights = matrix + penalty[:, None] + penalty[None, :]
+        np.fill_diagonal(weights, np.inf)
+        tree_cost, degree = _one_tree(weights)
+        bound = tree_cost - 2.0 * float(penalty.sum())
+        if bound > best + 1e-9:
+            best = bound
+            stale = 0
+        else:
+            stale += 1
+            if stale >= 5:
+                step_scale /= 2.0
+                stale = 0
+
+        subgradient = degree - 2
+        norm = float((subgradient * subgradient).sum())
+        if norm == 0:
+            # Every node has degree two: the 1-tree is a tour and the bound is tight.
+            return bound
+        penalty += step_scale * (upper_bound - bound) / norm * subgradient
+
+    return best or None
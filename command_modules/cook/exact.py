@@ -0,0 +1,62 @@
+#exact.py
+from __future__ import annotations
+
+from command_modules.cook.geometry import Geometry
+
+# Held-Karp is O(2^n * n^2); 15 points take well under a second.
+EXACT_MAX_POINTS = 15
+
+
+def held_karp(geo: Geometry) -> list[int]:
+    """Return a provably shortest closed tour by bitmask dynamic programming.
+
+    Node 0 is the fixed start, ``cost[mask][j]`` is the shortest path from it
+    through the nodes in ``mask`` ending at ``j``.
+    """
+    count = geo.count
+    if count < 4:
+        return list(range(count))
+
+    dist = geo.dist
+    others = count - 1
+    full = (1 << others) - 1
+    inf = float("inf")
+    cost = [[inf] * others for _ in range(1 << others)]
+    parent = [[-1] * others for _ in range(1 << others)]
+
+    for j in range(others):
+        cost[1 << j][j] = dist[0][j + 1]
+
+    for mask in range(1, full + 1):
+        members = [j for j in range(others) if mask >> j & 1]
+        if len(members) < 2:
+            continue
+        row_cost = cost[mask]
+        row_parent = parent[mask]
+        for j in members:
+            prev_mask = mask ^ (1 << j)
+            prev_cost = cost[prev_mask]
+            to_j = dist[j + 1]
+            best = inf
+            best_k = -1
+            for k in members:
+                if k == j:
+                    continue
+                candidate = prev_cost[k] + to_j[k + 1]
+                if candidate < best:
+                    best = candidate
+                    best_k = k
+            row_cost[j] = best
+            row_parent[j] = best_k
+
+    last = min(range(others), key=lambda j: cost[full][j] + dist[j + 1][0])
+    route = []
+    mask = full
+    while last != -1:
+        route.append(last + 1)
+        previous = parent[mask][last]
+        mask ^= 1 << last
+        last = previous
+    route.append(0)
+    route.reverse()
+    return route
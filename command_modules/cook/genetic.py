@@ -0,0 +1,124 @@
+#genetic.py
+from __future__ import annotations
+
+import random
+import time
+
+from command_modules.cook.construction import nearest_neighbor
+from command_modules.cook.geometry import Geometry
+from command_modules.cook.local_search import improve_route, reverse_segment
+from command_modules.cook.progress import ProgressReporter
+from command_modules.cook.solver import SOLVER_VERSION
+
+# Deep (genetic) cooks only pay off on long budgets.
+DEEP_MIN_SECONDS = 60
+POPULATION_SIZE = 12
+TOURNAMENT_SIZE = 3
+MUTATION_RATE = 0.3
+# Random 2-opt reversals applied by one mutation.
+MUTATION_MOVES = 3
+
+
+def order_crossover(parent_a: list[int], parent_b: list[int], rng: random.Random) -> list[int]:
+    """OX: keep a random slice of ``parent_a`` and fill the rest in ``parent_b``'s order."""
+    count = len(parent_a)
+    i = rng.randrange(count)
+    j = rng.randrange(count)
+    if i > j:
+        i, j = j, i
+    kept = parent_a[i:j + 1]
+    members = set(kept)
+    rest = [node for node in parent_b[j + 1:] + parent_b[:j + 1] if node not in members]
+    tail = count - j - 1
+    return rest[tail:] + kept + rest[:tail]
+
+
+def tournament_pick(members: list[list[int]], costs: list[float], rng: random.Random) -> list[int]:
+    """Shortest of ``TOURNAMENT_SIZE`` randomly drawn members."""
+    contenders = rng.sample(range(len(members)), min(TOURNAMENT_SIZE, len(members)))
+    return members[min(contenders, key=costs.__getitem__)]
+
+
+def mutate(route: list[int], rng: random.Random) -> None:
+    """Apply a few random 2-opt reversals in place."""
+    count = len(route)
+    for _ in range(MUTATION_MOVES):
+        i = rng.randrange(count)
+        j = rng.randrange(count)
+        if i != j:
+            reverse_segment(route, min(i, j), max(i, j))
+
+
+def evolve_island(
+    coords: list[tuple[float, float]],
+    time_limit: float,
+    seed: int,
+    population: list[list[int]] | None = None,
+    reporter: ProgressReporter | None = None,
+) -> dict:
+    """Run one island of the memetic GA for ``time_limit`` seconds.
+
+    Each generation breeds one child from two tournament-picked parents by
+    order crossover, mutates it with random 2-opt moves, repairs it with local
+    search and lets it replace the worst member if it is new and shorter.
+    ``population`` carries an island over from its previous round, migrants
+    included. ``reporter`` receives each new island best and can stop the
+    island early. Returns the population sorted best first and solver ``stats``.
+    """
+    started = time.perf_counter()
+    deadline = started + max(0.0, time_limit)
+
+    def time_up() -> bool:
+        if reporter is not None and reporter.stop_requested():
+            return True
+        return time.perf_counter() > deadline
+
+    rng = random.Random(seed)
+    geo = Geometry(coords)
+    count = geo.count
+    members = [route for route in population or [] if sorted(route) == list(range(count))]
+    while len(members) < POPULATION_SIZE and not (members and time_up()):
+        members.append(improve_route(geo, nearest_neighbor(geo, rng.randrange(count), time_up), time_up))
+
+    costs = [geo.cost(route) for route in members]
+    best_cost = min(costs)
+    if reporter is not None:
+        reporter.report(members[costs.index(best_cost)], best_cost)
+    generations = 0
+    if count >= 8:
+        while not time_up():
+            parent_a = tournament_pick(members, costs, rng)
+            parent_b = tournament_pick(members, costs, rng)
+            child = order_crossover(parent_a, parent_b, rng)
+            if rng.random() < MUTATION_RATE:
+                mutate(child, rng)
+            child = improve_route(geo, child, time_up)
+            child_cost = geo.cost(child)
+            generations += 1
+
+            worst = max(range(len(members)), key=costs.__getitem__)
+            if child_cost < costs[worst] and all(abs(child_cost - cost) > 1e-9 for cost in costs):
+                members[worst] = child
+                costs[worst] = child_cost
+                if child_cost < best_cost:
+                    best_cost = child_cost
+                    if reporter is not None:
+                        reporter.report(child, child_cost)
+
+    ranked = sorted(range(len(members)), key=costs.__getitem__)
+    return {
+        "population": [members[index] for index in ranked],
+        "cost": costs[ranked[0]],
+        "stats": {
+            "points": count,
+            "rounds": generations,
+            "strategy": "genetic",
+            "optimal": False,
+            "converged": False,
+            "stop_reason": "finished",
+            "lower_bound": None,
+            "gap": None,
+            "elapsed": time.perf_counter() - started,
+            "solver_version": SOLVER_VERSION,
+        },
+    }
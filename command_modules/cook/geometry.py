@@ -0,0 +1,109 @@
+#geometry.py
+from __future__ import annotations
+
+from array import array
+
+import numpy as np
+
+WORLD_SIZE = 160
+DEFAULT_NEIGHBORS = 10
+# Aim for about this many points per grid cell when bucketing.
+POINTS_PER_CELL = 2
+
+
+def build_distance_matrix(coords: list[tuple[float, float]]) -> np.ndarray:
+    """Pairwise Euclidean distances as an ``n x n`` array."""
+    if not coords:
+        return np.zeros((0, 0))
+    points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    return np.hypot(
+        points[:, None, 0] - points[None, :, 0],
+        points[:, None, 1] - points[None, :, 1],
+    )
+
+
+def matrix_rows(matrix: np.ndarray) -> list[array]:
+    """Copy ``matrix`` into one ``array('d')`` per row.
+
+    Typed rows index faster from Python loops than nested lists or ndarray lookups.
+    """
+    rows = []
+    for row in matrix:
+        typed = array("d")
+        typed.frombytes(np.ascontiguousarray(row, dtype=np.float64).tobytes())
+        rows.append(typed)
+    return rows
+
+
+def build_neighbor_lists(
+    coords: list[tuple[float, float]],
+    dist: list[array],
+    neighbor_count: int = DEFAULT_NEIGHBORS,
+) -> list[list[int]]:
+    """Nearest ``neighbor_count`` points for every point, closest first.
+
+    Points are bucketed on a uniform grid over the world square and each
+    search grows ring by ring until no unvisited cell can hold a closer point.
+    """
+    count = len(coords)
+    wanted = min(neighbor_count, count - 1)
+    if wanted <= 0:
+        return [[] for _ in range(count)]
+
+    cells_per_side = max(1, int((count / POINTS_PER_CELL) ** 0.5))
+    cell_size = (WORLD_SIZE * 2) / cells_per_side
+
+    def cell_of(value: float) -> int:
+        index = int((value + WORLD_SIZE) // cell_size)
+        return min(cells_per_side - 1, max(0, index))
+
+    buckets: dict[tuple[int, int], list[int]] = {}
+    cells = []
+    for index, (x, y) in enumerate(coords):
+        cell = (cell_of(x), cell_of(y))
+        cells.append(cell)
+        buckets.setdefault(cell, []).append(index)
+
+    neighbors = []
+    for index in range(count):
+        row = dist[index]
+        cell_x, cell_y = cells[index]
+        found: list[int] = []
+        ring = 0
+        while True:
+            for grid_x in range(cell_x - ring, cell_x + ring + 1):
+                for grid_y in range(cell_y - ring, cell_y + ring + 1):
+                    if max(abs(grid_x - cell_x), abs(grid_y - cell_y)) != ring:
+                        continue
+                    found.extend(buckets.get((grid_x, grid_y), ()))
+            if len(found) > wanted:
+                found.sort(key=row.__getitem__)
+                # Anything in the next ring is at least ``ring * cell_size`` away.
+                if row[found[wanted]] <= ring * cell_size or ring >= cells_per_side:
+                    break
+            elif ring >= cells_per_side:
+                break
+            ring += 1
+        neighbors.append([other for other in found if other != index][:wanted])
+    return neighbors
+
+
+class Geometry:
+    """Distance matrix and candidate lists shared by every heuristic in one solve."""
+
+    def __init__(self, coords: list[tuple[float, float]], neighbor_count: int = DEFAULT_NEIGHBORS):
+        self.coords = coords
+        self.count = len(coords)
+        self.matrix = build_distance_matrix(coords)
+        self.dist = matrix_rows(self.matrix)
+        self.neighbors = build_neighbor_lists(coords, self.dist, neighbor_count)
+
+    def cost(self, route: list[int]) -> float:
+        count = len(route)
+        if count < 2:
+            return 0.0
+        dist = self.dist
+        total = dist[route[-1]][route[0]]
+        for i in range(count - 1):
+            total += dist[route[i]][route[i + 1]]
+        return total
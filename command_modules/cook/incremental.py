@@ -0,0 +1,119 @@
+#incremental.py
+from __future__ import annotations
+
+import math
+import time
+
+from command_modules.cook.geometry import Geometry
+from command_modules.cook.lin_kernighan import lin_kernighan
+from command_modules.cook.local_search import improve_route
+from command_modules.cook.route_store import COORD_DECIMALS
+from command_modules.cook.solver import SOLVER_VERSION
+
+# Above this many added or removed pearls a repaired route only warm-starts a full cook.
+INCREMENTAL_MAX_CHANGES = 5
+
+
+def _rounded(point) -> tuple[float, float]:
+    return (round(point[0], COORD_DECIMALS), round(point[1], COORD_DECIMALS))
+
+
+def carry_over_route(
+    coords: list[tuple[float, float]],
+    previous_coords: list[tuple[float, float]],
+    previous_route: list[int],
+) -> tuple[list[int], list[int], int] | None:
+    """Map ``previous_route`` onto ``coords``, splicing out and inserting changed points.
+
+    Removed points are dropped from the tour and every new point goes in at its
+    cheapest position. Returns the repaired route, the nodes next to a change
+    and how many points changed, or None when the two sets share too little.
+    """
+    slots: dict[tuple[float, float], list[int]] = {}
+    for index, point in enumerate(coords):
+        slots.setdefault(_rounded(point), []).append(index)
+
+    route = []
+    spliced = []
+    removed = 0
+    gap = False
+    for old_index in previous_route:
+        if not 0 <= old_index < len(previous_coords):
+            return None
+        matches = slots.get(_rounded(previous_coords[old_index]))
+        if not matches:
+            removed += 1
+            gap = True
+            continue
+        if gap:
+            spliced.append(len(route))
+            gap = False
+        route.append(matches.pop())
+    if gap:
+        spliced.append(0)
+
+    added = [index for indices in slots.values() for index in indices]
+    if len(route) < max(3, len(added)):
+        return None
+
+    touched = set()
+    for position in spliced:
+        touched.update((route[position - 1], route[position]))
+
+    for node in added:
+        x, y = coords[node]
+        best_pos = 0
+        best_delta = float("inf")
+        for i in range(len(route)):
+            a = coords[route[i - 1]]
+            b = coords[route[i]]
+            delta = (
+                math.hypot(x - a[0], y - a[1])
+                + math.hypot(x - b[0], y - b[1])
+                - math.hypot(a[0] - b[0], a[1] - b[1])
+            )
+            if delta < best_delta:
+                best_delta = delta
+                best_pos = i
+        touched.update((route[best_pos - 1], route[best_pos], node))
+        route.insert(best_pos, node)
+
+    return route, sorted(touched), removed + len(added)
+
+
+def repair_route(
+    coords: list[tuple[float, float]],
+    route: list[int],
+    touched: list[int],
+    time_limit: float,
+) -> dict:
+    """Polish a carried-over ``route`` around the ``touched`` nodes only.
+
+    Returns the same shape as ``solve_route``; the repair normally finishes in
+    milliseconds and never runs past ``time_limit``.
+    """
+    started = time.perf_counter()
+    deadline = started + max(0.0, time_limit)
+
+    def time_up() -> bool:
+        return time.perf_counter() > deadline
+
+    geo = Geometry(coords)
+    route = lin_kernighan(geo, route, time_up, active=touched)
+    route = improve_route(geo, route, time_up, active=touched)
+    return {
+        "route": route,
+        "cost": geo.cost(route),
+        "stats": {
+            "points": geo.count,
+            "rounds": 1,
+            "strategy": "repair",
+            "optimal": False,
+            "converged": True,
+            "stop_reason": "repaired",
+            "lower_bound": None,
+            "gap": None,
+            "elapsed": time.perf_counter() - started,
+            "solver_version": SOLVER_VERSION,
+        },
+    }
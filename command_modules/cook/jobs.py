@@ -0,0 +1,168 @@
+#jobs.py
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import defaultdict, deque
+
+# A cook still running this long after it left the queue is stopped.
+TIMEOUT_GRACE = 30.0
+# How often (seconds) a queued cook re-reads its queue position.
+QUEUE_POLL_INTERVAL = 1.0
+
+
+class CookQueueFull(Exception):
+    """Raised by ``CookJobs.start`` when every queue slot is taken."""
+
+
+class CookJob:
+    """One /cook run: the bot task driving it and the stop flag its pool workers poll.
+
+    ``outcome`` resolves with whatever the owner publishes, so coalesced
+    requests with the same ``signature`` can share it; it is cancelled with the job.
+    """
+
+    def __init__(self, key: str, job_id: int, seconds: int, signature=None):
+        self.key = key
+        self.job_id = job_id
+        self.seconds = seconds
+        self.signature = signature
+        self.queued_at = time.monotonic()
+        self.started: float | None = None
+        self.task: asyncio.Task | None = None
+        self.stop = None
+        self.cancelled = False
+        self.reason: str | None = None
+        self.outcome: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._turn = asyncio.Event()
+        self._watchdog: asyncio.Task | None = None
+
+    def attach_stop(self, stop) -> None:
+        """Hand over the ``open_cook_channel`` stop flag once the solve is set up."""
+        self.stop = stop
+        if self.cancelled:
+            stop.set()
+
+    async def cancel(self, reason: str) -> None:
+        """Stop the workers and the bot task; running pool tasks end within a poll interval."""
+        if self.cancelled:
+            return
+        self.cancelled = True
+        self.reason = reason
+        if not self.outcome.done():
+            self.outcome.cancel()
+        if self.stop is not None:
+            try:
+                await asyncio.to_thread(self.stop.set)
+            except Exception as exc:
+                print(f"⚠️ Could not signal cook {self.key}#{self.job_id}: {exc}")
+        self._turn.set()
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+
+class CookJobs:
+    """FIFO scheduler for cooks: at most ``max_running`` solve at once, ``max_queued`` wait.
+
+    There is one live cook per key (village); a newer cook supersedes the older one.
+    """
+
+    def __init__(self, max_running: int = 1, max_queued: int = 10, grace: float = TIMEOUT_GRACE):
+        self.max_running = max(1, max_running)
+        self.max_queued = max(0, max_queued)
+        self.grace = grace
+        self.jobs: dict[str, CookJob] = {}
+        self.ids: defaultdict[str, int] = defaultdict(int)
+        self.waiting: deque[CookJob] = deque()
+        self.running: list[CookJob] = []
+
+    async def start(self, key: str, seconds: int, signature=None) -> CookJob:
+        """Queue a new cook for ``key``; raises ``CookQueueFull`` if no slot is free."""
+        existing = self.jobs.get(key)
+        if existing is None and len(self.waiting) >= self.max_queued:
+            raise CookQueueFull(f"{len(self.waiting)} cooks are already waiting")
+        if existing is not None:
+            await existing.cancel("superseded by a newer cook")
+            self.finish(existing)
+
+        self.ids[key] += 1
+        job = CookJob(key, self.ids[key], seconds, signature)
+        self.jobs[key] = job
+        self.waiting.append(job)
+        self._dispatch()
+        return job
+
+    def find(self, signature) -> CookJob | None:
+        """Live (queued or running) cook started with ``signature``, to coalesce onto."""
+        for job in self.jobs.values():
+            if job.signature == signature and not job.cancelled:
+                return job
+        return None
+
+    def position(self, job: CookJob) -> int:
+        """1-based place in the queue, 0 once running."""
+        try:
+            return self.waiting.index(job) + 1
+        except ValueError:
+            return 0
+
+    async def wait_turn(self, job: CookJob, on_position=None) -> None:
+        """Return once ``job`` may run; ``on_position`` is awaited whenever its place changes."""
+        shown = None
+        while job not in self.running:
+            if job.cancelled:
+                raise asyncio.CancelledError()
+            position = self.position(job)
+            if position != shown and on_position is not None:
+                shown = position
+                await on_position(position)
+            try:
+                await asyncio.wait_for(job._turn.wait(), QUEUE_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self) -> None:
+        while self.waiting and len(self.running) < self.max_running:
+            job = self.waiting.popleft()
+            job.started = time.monotonic()
+            self.running.append(job)
+            job._turn.set()
+            job._watchdog = asyncio.create_task(self._expire(job))
+
+    def is_current(self, job: CookJob) -> bool:
+        return not job.cancelled and self.jobs.get(job.key) is job
+
+    def get(self, key: str) -> CookJob | None:
+        return self.jobs.get(key)
+
+    def finish(self, job: CookJob) -> None:
+        """Drop ``job`` and hand its slot to the next queued cook."""
+        if self.jobs.get(job.key) is job:
+            del self.jobs[job.key]
+        if job in self.waiting:
+            self.waiting.remove(job)
+        if job in self.running:
+            self.running.remove(job)
+        if not job.outcome.done():
+            job.outcome.cancel()
+        if job._watchdog is not None and job._watchdog is not asyncio.current_task():
+            job._watchdog.cancel()
+        self._dispatch()
+
+    async def cancel(self, key: str, reason: str) -> bool:
+        job = self.jobs.get(key)
+        if job is None:
+            return False
+        await job.cancel(reason)
+        self.finish(job)
+        return True
+
+    async def cancel_all(self, reason: str) -> None:
+        for key in list(self.jobs):
+            await self.cancel(key, reason)
+
+    async def _expire(self, job: CookJob) -> None:
+        await asyncio.sleep(job.seconds + self.grace)
+        if self.jobs.get(job.key) is job:
+            await job.cancel("timed out")
+            self.finish(job)
@@ -0,0 +1,180 @@
+#lin_kernighan.py
+from __future__ import annotations
+
+import random
+from collections import deque
+
+from command_modules.cook.geometry import Geometry
+from command_modules.cook.local_search import EPSILON, reverse_segment
+
+LK_MAX_DEPTH = 8
+# Alternatives tried for the first added edge before giving up on a start node.
+LK_FIRST_BREADTH = 5
+# Longest segment a double-bridge kick may cut, to keep kicks local.
+KICK_SEGMENT = 30
+
+
+def lin_kernighan(
+    geo: Geometry,
+    route: list[int],
+    time_up,
+    active: list[int] | None = None,
+    max_depth: int = LK_MAX_DEPTH,
+) -> list[int]:
+    """Variable-depth improvement built from chained 2-opt moves.
+
+    From each start node ``t1`` the chain repeatedly breaks the edge at ``t1``,
+    joins its far end to a candidate neighbour and keeps going while the
+    cumulative gain stays positive, up to ``max_depth`` moves. The chain is
+    rolled back to its most profitable prefix. Only nodes in ``active`` (or all
+    nodes) start queued; others are woken when their edges change.
+    """
+    count = len(route)
+    if count < 5:
+        return route[:]
+
+    route = route[:]
+    dist = geo.dist
+    neighbors = geo.neighbors
+    pos = [0] * count
+    for index, node in enumerate(route):
+        pos[node] = index
+
+    start_nodes = route if active is None else active
+    queue = deque(start_nodes)
+    queued = [False] * count
+    for node in start_nodes:
+        queued[node] = True
+
+    def wake(nodes) -> None:
+        for node in nodes:
+            if not queued[node]:
+                queued[node] = True
+                queue.append(node)
+
+    def neighbor_of(node: int, forward: bool) -> int:
+        index = pos[node] + (1 if forward else -1)
+        if index == count:
+            index = 0
+        return route[index]
+
+    def run_chain(t1: int, forward: bool) -> list[int] | None:
+        t2 = neighbor_of(t1, forward)
+        open_gain = dist[t1][t2]
+        moves: list[tuple[int, int]] = []
+        touched = [t1, t2]
+        best_gain = EPSILON
+        best_depth = 0
+        used = {t1, t2}
+
+        for depth in range(1, max_depth + 1):
+            options = []
+            row_t2 = dist[t2]
+            for t3 in neighbors[t2]:
+                partial = open_gain - row_t2[t3]
+                if partial <= EPSILON:
+                    break
+                if t3 in used:
+                    continue
+                t4 = neighbor_of(t3, not forward)
+                if t4 == t2 or t4 in used:
+                    continue
+                options.append((partial + dist[t3][t4], t3, t4))
+            if not options:
+                break
+            options.sort(reverse=True)
+            _, t3, t4 = options[0]
+            if depth == 1 and len(options) > 1:
+                # Prefer the first alternative whose closed move already pays off.
+                for candidate in options[:LK_FIRST_BREADTH]:
+                    if candidate[0] - dist[candidate[2]][t1] > EPSILON:
+                        _, t3, t4 = candidate
+                        break
+
+            if forward:
+                move = (pos[t2], pos[t4])
+            else:
+                move = (pos[t4], pos[t2])
+            reverse_segment(route, move[0], move[1], pos)
+            moves.append(move)
+            if neighbor_of(t1, forward) != t4:
+                # The complement was reversed, which flips the array orientation.
+                forward = not forward
+            touched.extend((t3, t4))
+            used.update((t3, t4))
+
+            open_gain = open_gain - row_t2[t3] + dist[t3][t4]
+            closed_gain = open_gain - dist[t4][t1]
+            if closed_gain > best_gain:
+                best_gain = closed_gain
+                best_depth = depth
+            t2 = t4
+
+        for move in reversed(moves[best_depth:]):
+            reverse_segment(route, move[0], move[1], pos)
+        if best_depth == 0:
+            return None
+        return touched[: 2 + 2 * best_depth]
+
+    checks = 0
+    while queue:
+        checks += 1
+        if not checks & 0x1F and time_up():
+            break
+        t1 = queue.popleft()
+        queued[t1] = False
+        for forward in (True, False):
+            touched = run_chain(t1, forward)
+            if touched:
+                wake(touched)
+                break
+
+    return route
+
+
+def double_bridge(route: list[int], rng: random.Random) -> tuple[list[int], list[int]]:
+    """Apply a local double-bridge kick; returns the new tour and the nodes whose edges changed."""
+    count = len(route)
+    start = rng.randrange(count)
+    rotated = route[start:] + route[:start]
+    span = min(KICK_SEGMENT, (count - 1) // 3)
+    first = 1 + rng.randrange(span)
+    second = first + 1 + rng.randrange(span)
+    third = second + 1 + rng.randrange(span)
+    kicked = rotated[:first] + rotated[second:third] + rotated[first:second] + rotated[third:]
+    endpoints = [
+        rotated[0], rotated[first - 1], rotated[first], rotated[second - 1],
+        rotated[second], rotated[third - 1], rotated[third % count], rotated[-1],
+    ]
+    return kicked, endpoints
+
+
+def iterated_lin_kernighan(
+    geo: Geometry,
+    route: list[int],
+    rng: random.Random,
+    time_up,
+    on_improve=None,
+) -> list[int]:
+    """Improve ``route`` with LK, then keep kicking and repairing the best tour until time is up.
+
+    ``on_improve`` receives each new best cost and tour.
+    """
+    best = lin_kernighan(geo, route, time_up)
+    best_cost = geo.cost(best)
+    if on_improve is not None:
+        on_improve(best_cost, best)
+    if geo.count < 8:
+        return best
+
+    while not time_up():
+        kicked, endpoints = double_bridge(best, rng)
+        candidate = lin_kernighan(geo, kicked, time_up, active=endpoints)
+        candidate_cost = geo.cost(candidate)
+        if candidate_cost < best_cost - EPSILON:
+            best = candidate
+            best_cost = candidate_cost
+            if on_improve is not None:
+                on_improve(best_cost, best)
+
+    return best
@@ -0,0 +1,167 @@
+#local_search.py
+from __future__ import annotations
+
+from collections import deque
+
+from command_modules.cook.geometry import Geometry
+
+OR_OPT_MAX_SEGMENT = 3
+EPSILON = 1e-9
+
+
+def reverse_segment(route: list[int], i: int, j: int, pos: list[int] | None = None) -> None:
+    """Reverse positions ``i``..``j`` of the closed tour in place, wrapping past the end.
+
+    When ``pos`` (node -> position) is given it is kept in sync.
+    """
+    count = len(route)
+    length = (j - i) % count + 1
+    if length * 2 > count:
+        # Reversing the complement yields the same cycle with less copying.
+        i, j = (j + 1) % count, (i - 1) % count
+        length = count - length
+    for _ in range(length // 2):
+        a = route[j]
+        b = route[i]
+        route[i] = a
+        route[j] = b
+        if pos is not None:
+            pos[a] = i
+            pos[b] = j
+        i = i + 1 if i + 1 < count else 0
+        j = j - 1 if j > 0 else count - 1
+
+
+def move_segment(
+    route: list[int],
+    pos: list[int],
+    start: int,
+    length: int,
+    after_node: int,
+    reverse: bool,
+) -> None:
+    """Cut ``length`` nodes starting at position ``start`` and reinsert them after ``after_node``."""
+    count = len(route)
+    segment = [route[(start + k) % count] for k in range(length)]
+    if reverse:
+        segment.reverse()
+    members = set(segment)
+    rest = [node for node in route[start:] + route[:start] if node not in members]
+    insert_at = rest.index(after_node) + 1
+    route[:] = rest[:insert_at] + segment + rest[insert_at:]
+    for index, node in enumerate(route):
+        pos[node] = index
+
+
+def improve_route(
+    geo: Geometry,
+    route: list[int],
+    time_up,
+    active: list[int] | None = None,
+) -> list[int]:
+    """Run 2-opt and Or-opt to a local optimum, driven by candidate lists.
+
+    Each node carries a don't-look bit: it is only re-examined after one of its
+    tour edges changed, so converged stretches of the tour are skipped. Only
+    nodes in ``active`` (or all nodes) start queued.
+    """
+    count = len(route)
+    if count < 5:
+        return route[:]
+
+    route = route[:]
+    dist = geo.dist
+    neighbors = geo.neighbors
+    pos = [0] * count
+    for index, node in enumerate(route):
+        pos[node] = index
+
+    start_nodes = route if active is None else active
+    queue = deque(start_nodes)
+    queued = [False] * count
+    for node in start_nodes:
+        queued[node] = True
+
+    def wake(*nodes: int) -> None:
+        for node in nodes:
+            if not queued[node]:
+                queued[node] = True
+                queue.append(node)
+
+    def succ(node: int) -> int:
+        index = pos[node] + 1
+        return route[index] if index < count else route[0]
+
+    def pred(node: int) -> int:
+        return route[pos[node] - 1]
+
+    def try_two_opt(a: int) -> bool:
+        row_a = dist[a]
+        for forward in (True, False):
+            b = succ(a) if forward else pred(a)
+            d_ab = row_a[b]
+            for c in neighbors[a]:
+                d_ac = row_a[c]
+                if d_ac >= d_ab:
+                    break
+                d = succ(c) if forward else pred(c)
+                if c == b or d == a:
+                    continue
+                delta = d_ac + dist[b][d] - d_ab - dist[c][d]
+                if delta < -EPSILON:
+                    if forward:
+                        # a->b ... c->d becomes a->c ... b->d
+                        reverse_segment(route, pos[b], pos[c], pos)
+                    else:
+                        # d->c ... b->a becomes d->b ... c->a
+                        reverse_segment(route, pos[c], pos[b], pos)
+                    wake(a, b, c, d)
+                    return True
+        return False
+
+    def try_or_opt(a: int) -> bool:
+        for length in range(1, OR_OPT_MAX_SEGMENT + 1):
+            if count < length + 3:
+                break
+            starts = {pos[a], (pos[a] - length + 1) % count}
+            for start in starts:
+                first = route[start]
+                last = route[(start + length - 1) % count]
+                prev_node = route[start - 1]
+                next_node = route[(start + length) % count]
+                members = {route[(start + k) % count] for k in range(length)}
+
+                removal_gain = dist[prev_node][first] + dist[last][next_node] - dist[prev_node][next_node]
+                if removal_gain <= EPSILON:
+                    continue
+
+                for end_node in (first, last):
+                    row_end = dist[end_node]
+                    for c in neighbors[end_node]:
+                        if row_end[c] >= removal_gain:
+                            break
+                        if c in members:
+                            continue
+                        for u, v in ((c, succ(c)), (pred(c), c)):
+                            if u in members or v in members:
+                                continue
+                            d_uv = dist[u][v]
+                            keep = dist[u][first] + dist[last][v] - d_uv
+                            flip = dist[u][last] + dist[first][v] - d_uv
+                            if min(keep, flip) < removal_gain - EPSILON:
+                                move_segment(route, pos, start, length, u, flip < keep)
+                                wake(prev_node, next_node, first, last, u, v)
+                                return True
+        return False
+
+    checks = 0
+    while queue:
+        checks += 1
+        if not checks & 0x3F and time_up():
+            break
+        node = queue.popleft()
+        queued[node] = False
+        if try_two_opt(node) or try_or_opt(node):
+            wake(node)
+
+    return route
@@ -0,0 +1,95 @@
+#overlay.py
+from __future__ import annotations
+
+import io
+
+from PIL import Image, ImageDraw
+
+WORLD_SIZE = 160
+CANVAS_SIZE = 1280
+
+# Stroke sizes are in points (matplotlib's units, kept from the old figure) at 100 dpi.
+LINE_WIDTH = 1.3
+NODE_SIZE = 8
+PX_PER_POINT = 100 / 72
+SUPERSAMPLE = 2
+# The background plot keeps matplotlib's default axes box (left, bottom, right, top as
+# figure fractions); canvas coordinates map into that box, as in the old overlay figure.
+AXES_BOX = (0.125, 0.11, 0.9, 0.88)
+
+X_OFFSET = 0
+Y_OFFSET = 1
+
+X_SQUEEZE = 1.0
+Y_SQUEEZE = 1.0
+
+MARGIN = 0
+
+
+def world_to_canvas(x: float, y: float) -> tuple[float, float]:
+    scale = (CANVAS_SIZE - 2 * MARGIN) / (WORLD_SIZE * 2)
+    center = CANVAS_SIZE / 2
+
+    nx = (x + WORLD_SIZE) * scale + MARGIN
+    ny = (y + WORLD_SIZE) * scale + MARGIN
+
+    # The village maps are drawn with the x axis flipped.
+    nx = CANVAS_SIZE - nx
+
+    nx = center + (nx - center) * X_SQUEEZE
+    ny = center + (ny - center) * Y_SQUEEZE
+
+    return nx + X_OFFSET, ny + Y_OFFSET
+
+
+def canvas_to_pixel(x: float, y: float) -> tuple[float, float]:
+    """Canvas coordinates to Pillow pixels inside ``AXES_BOX``; Pillow's y grows downwards."""
+    left, bottom, right, top = AXES_BOX
+    px = (left + (right - left) * x / CANVAS_SIZE) * CANVAS_SIZE
+    py = (1 - bottom - (top - bottom) * y / CANVAS_SIZE) * CANVAS_SIZE
+    return px, py
+
+
+def draw_route_layer(
+    coords: list[tuple[float, float]],
+    route: list[int],
+    size: tuple[int, int] = (CANVAS_SIZE, CANVAS_SIZE),
+) -> Image.Image:
+    """Draw ``route`` as a closed white walk on a transparent RGBA layer of ``size``.
+
+    ``size`` is the image the layer goes over; the canvas and stroke widths
+    scale to it. The walk is drawn at ``SUPERSAMPLE`` times that size and
+    scaled down once, which antialiases it like the matplotlib figure this replaces.
+    """
+    if not route:
+        route = list(range(len(coords)))
+    width, height = size
+    scale_x = width / CANVAS_SIZE * SUPERSAMPLE
+    scale_y = height / CANVAS_SIZE * SUPERSAMPLE
+    stroke = (scale_x + scale_y) / 2 * PX_PER_POINT
+    layer = Image.new("RGBA", (width * SUPERSAMPLE, height * SUPERSAMPLE), (0, 0, 0, 0))
+    pts = [canvas_to_pixel(*world_to_canvas(*coords[i])) for i in route if i < len(coords)]
+    if pts:
+        pts = [(x * scale_x, y * scale_y) for x, y in pts]
+        draw = ImageDraw.Draw(layer)
+        draw.line(pts + [pts[0]], fill="white", width=max(1, round(LINE_WIDTH * stroke)))
+        radius = NODE_SIZE ** 0.5 / 2 * stroke
+        outline = max(1, round(0.3 * stroke))
+        for x, y in pts:
+            draw.ellipse(
+                (x - radius, y - radius, x + radius, y + radius),
+                fill="white",
+                outline="black",
+                width=outline,
+            )
+    return layer.resize(size, Image.Resampling.LANCZOS)
+
+
+def composite_route(background: bytes, coords: list[tuple[float, float]], route: list[int]) -> io.BytesIO:
+    """Draw ``route`` over the ``background`` PNG and return the result as PNG."""
+    base = Image.open(io.BytesIO(background)).convert("RGBA")
+    layer = draw_route_layer(coords, route, base.size)
+    buf = io.BytesIO()
+    Image.alpha_composite(base, layer).save(buf, format="PNG")
+    buf.seek(0)
+    return buf
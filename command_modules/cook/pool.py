@@ -0,0 +1,443 @@
+#pool.py
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from command_modules.cook.exact import EXACT_MAX_POINTS
+from command_modules.cook.genetic import evolve_island
+from command_modules.cook.incremental import INCREMENTAL_MAX_CHANGES, carry_over_route, repair_route
+from command_modules.cook.progress import ProgressReporter
+from command_modules.cook.route_store import RouteStore
+from command_modules.cook.solver import DEFAULT_SEED, SOLVER_VERSION, solve_route
+
+# Parallel cooks hand the best tour between workers this often (seconds).
+SHARE_INTERVAL = 5.0
+# Deep cooks migrate tours between islands this often (seconds).
+MIGRATION_INTERVAL = 15.0
+# Background pre-cooks run this much nicer than the bot so interactive cooks win the CPU.
+PRECOOK_NICENESS = 10
+
+_POOL: ProcessPoolExecutor | None = None
+_PRECOOK_POOL: ProcessPoolExecutor | None = None
+_MANAGER = None
+# open_cook_channel runs on worker threads; only one of them may start the manager.
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_cook_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        # Spawned workers re-run main.py as __mp_main__; it only imports the bot
+        # (bot.py) under its __main__ guard, so workers load just the solver.
+        _POOL = ProcessPoolExecutor(
+            max_workers=max(1, max_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _POOL
+
+
+def _lower_priority() -> None:
+    try:
+        os.nice(PRECOOK_NICENESS)
+    except (AttributeError, OSError):
+        pass
+
+
+def get_precook_pool() -> ProcessPoolExecutor:
+    """Single low-priority worker for background pre-cooks, apart from the interactive pool."""
+    global _PRECOOK_POOL
+    if _PRECOOK_POOL is None:
+        _PRECOOK_POOL = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_lower_priority,
+        )
+    return _PRECOOK_POOL
+
+
+def open_cook_channel():
+    """New progress queue and stop flag for one cook, shareable with pool workers."""
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = multiprocessing.get_context("spawn").Manager()
+        manager = _MANAGER
+    return manager.Queue(), manager.Event()
+
+
+def shutdown_cook_pool() -> None:
+    global _POOL, _PRECOOK_POOL, _MANAGER
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+    if _PRECOOK_POOL is not None:
+        _PRECOOK_POOL.shutdown(wait=False, cancel_futures=True)
+        _PRECOOK_POOL = None
+    with _MANAGER_LOCK:
+        if _MANAGER is not None:
+            _MANAGER.shutdown()
+            _MANAGER = None
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget ``pool`` after a worker died in it; the next cook builds a fresh one."""
+    global _POOL, _PRECOOK_POOL
+    if _POOL is pool:
+        _POOL = None
+    elif _PRECOOK_POOL is pool:
+        _PRECOOK_POOL = None
+    else:
+        return
+    print("⚠️ A cook worker died; restarting the cook pool.")
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _stop_requested(reporter: ProgressReporter | None) -> bool:
+    try:
+        return reporter is not None and reporter.stop is not None and reporter.stop.is_set()
+    except Exception:
+        return False
+
+
+def _covers(entry: dict, time_limit: float) -> bool:
+    if entry.get("optimal"):
+        return True
+    return entry.get("solver_version") == SOLVER_VERSION and entry.get("time_limit", 0) >= time_limit
+
+
+def _cached_result(entry: dict, count: int) -> dict:
+    return {
+        "route": entry["route"],
+        "cost": entry["cost"],
+        "stats": {
+            "points": count,
+            "rounds": 0,
+            "strategy": entry.get("strategy"),
+            "optimal": bool(entry.get("optimal")),
+            "converged": True,
+            "stop_reason": "cached",
+            "lower_bound": None,
+            "gap": None,
+            "elapsed": 0.0,
+            "solver_version": entry.get("solver_version"),
+            "cache": "hit",
+        },
+    }
+
+
+def prepare_cook(
+    coords: list[tuple[float, float]],
+    time_limit: float,
+    store: RouteStore | None = None,
+    scope: str | None = None,
+) -> dict:
+    """Look ``coords`` up in ``store`` before solving.
+
+    Returns ``result`` when a stored or locally repaired route already answers
+    the cook, otherwise the ``warm`` route (or None) the solve should start
+    from. ``cooked_for`` is how long the remembered route will count as cooked.
+    """
+    cached = store.get(coords) if store is not None else None
+    previous = None
+    if cached is None and store is not None and scope is not None:
+        previous = store.latest(scope)
+    carried = carry_over_route(coords, previous["coords"], previous["route"]) if previous else None
+
+    if cached is not None and _covers(cached, time_limit):
+        return {
+            "result": _cached_result(cached, len(coords)),
+            "warm": None,
+            "cooked_for": max(time_limit, cached.get("time_limit", 0)),
+        }
+    if (
+        carried is not None
+        and carried[2] <= INCREMENTAL_MAX_CHANGES
+        and previous.get("time_limit", 0) >= time_limit
+    ):
+        route, touched, _ = carried
+        result = repair_route(coords, route, touched, time_limit)
+        result["stats"]["cache"] = "repaired"
+        # Repairs inherit how long their source route was cooked.
+        return {"result": result, "warm": None, "cooked_for": previous["time_limit"]}
+    warm = cached["route"] if cached else carried[0] if carried else None
+    return {"result": None, "warm": warm, "cooked_for": time_limit}
+
+
+def finish_cook(
+    coords: list[tuple[float, float]],
+    result: dict,
+    time_limit: float,
+    cooked_for: float,
+    store: RouteStore | None = None,
+    scope: str | None = None,
+) -> dict:
+    """Record ``result`` in ``store``."""
+    if result["stats"].get("stop_reason") == "stopped":
+        # A cook stopped early only counts as cooked for as long as it ran.
+        time_limit = min(time_limit, result["stats"].get("elapsed", time_limit))
+        cooked_for = min(cooked_for, time_limit)
+    if store is not None:
+        try:
+            if result["stats"]["cache"] != "hit":
+                store.put(coords, result["route"], result["cost"], time_limit, result["stats"])
+            if scope is not None:
+                store.remember(scope, coords, result["route"], result["cost"], cooked_for)
+        except OSError as exc:
+            print(f"⚠️ Could not store cook route: {exc}")
+    return result
+
+
+def cook_route(
+    coords: list[tuple[float, float]],
+    time_limit: float,
+    stall_window: float | None = None,
+    target_gap: float | None = None,
+    store: RouteStore | None = None,
+    scope: str | None = None,
+    reporter: ProgressReporter | None = None,
+) -> dict:
+    """Solve (or fetch from ``store``) the route over ``coords``.
+
+    A stored route is reused as-is when it is optimal or was cooked at least as
+    long by the current solver; otherwise it warm-starts the new solve. When the
+    exact point set is unknown but ``scope`` (village and colour) was cooked
+    before, that route is carried over instead: removed pearls are spliced out
+    and new ones inserted. A handful of changes to a route cooked at least as
+    long is only repaired locally, which takes milliseconds. ``reporter``
+    streams improving tours while solving.
+    """
+    plan = prepare_cook(coords, time_limit, store, scope)
+    result = plan["result"]
+    if result is None:
+        result = solve_route(
+            coords,
+            time_limit,
+            stall_window=stall_window,
+            target_gap=target_gap,
+            initial_route=plan["warm"],
+            reporter=reporter,
+        )
+        result["stats"]["cache"] = "warm" if plan["warm"] else "miss"
+    return finish_cook(coords, result, time_limit, plan["cooked_for"], store, scope)
+
+
+async def cook_route_parallel(
+    max_workers: int,
+    coords: list[tuple[float, float]],
+    time_limit: float,
+    stall_window: float | None = None,
+    target_gap: float | None = None,
+    store: RouteStore | None = None,
+    scope: str | None = None,
+    starts: int | None = None,
+    reporter: ProgressReporter | None = None,
+) -> dict:
+    """``cook_route`` with the solve fanned out over ``starts`` pool workers (default ``max_workers``).
+
+    The budget is cut into rounds of about ``SHARE_INTERVAL`` seconds. Each
+    worker runs a differently seeded solve, and the best tour of a round seeds
+    every worker of the next. The cook ends early once a round is optimal,
+    reaches the target gap, stalls everywhere without beating the last one, or
+    ``reporter`` asks it to stop. ``starts`` is capped at ``max_workers``: extra
+    runs would queue behind the others and stretch every round past its budget.
+    """
+    starts = max(1, min(starts or max_workers, max_workers))
+    if starts == 1 or len(coords) <= EXACT_MAX_POINTS:
+        return await run_in_cook_pool(
+            max_workers, cook_route, coords, time_limit, stall_window, target_gap, store, scope, reporter
+        )
+
+    plan = await run_in_cook_pool(max_workers, prepare_cook, coords, time_limit, store, scope)
+    result = plan["result"]
+    if result is None:
+        started = time.perf_counter()
+        round_count = max(1, round(time_limit / SHARE_INTERVAL))
+        warm = plan["warm"]
+        seed = DEFAULT_SEED
+        total_rounds = 0
+        stop_reason = "finished"
+        for _ in range(round_count):
+            remaining = time_limit - (time.perf_counter() - started)
+            if remaining <= 0:
+                break
+            runs = await asyncio.gather(*(
+                run_in_cook_pool(
+                    max_workers,
+                    solve_route,
+                    coords,
+                    min(time_limit / round_count, remaining),
+                    seed + offset,
+                    "auto",
+                    stall_window,
+                    target_gap,
+                    warm,
+                    reporter,
+                )
+                for offset in range(starts)
+            ))
+            seed += starts
+            total_rounds += sum(run["stats"]["rounds"] for run in runs)
+            best = min(runs, key=lambda run: run["cost"])
+            improved = result is None or best["cost"] < result["cost"] - 1e-9
+            if improved:
+                result = best
+                warm = best["route"]
+
+            reasons = {run["stats"]["stop_reason"] for run in runs}
+            if best["stats"]["optimal"] or "gap" in reasons:
+                stop_reason = "optimal" if best["stats"]["optimal"] else "gap"
+                break
+            if "stopped" in reasons or await asyncio.to_thread(_stop_requested, reporter):
+                stop_reason = "stopped"
+                break
+            if not improved and reasons == {"stalled"}:
+                stop_reason = "stalled"
+                break
+
+        stats = result["stats"]
+        stats["rounds"] = total_rounds
+        stats["workers"] = starts
+        stats["stop_reason"] = stop_reason
+        stats["converged"] = stop_reason in ("optimal", "gap", "stalled", "stopped")
+        stats["elapsed"] = time.perf_counter() - started
+        stats["cache"] = "warm" if plan["warm"] else "miss"
+
+    return await run_in_cook_pool(
+        max_workers, finish_cook, coords, result, time_limit, plan["cooked_for"], store, scope
+    )
+
+
+async def cook_route_deep(
+    max_workers: int,
+    coords: list[tuple[float, float]],
+    time_limit: float,
+    store: RouteStore | None = None,
+    scope: str | None = None,
+    islands: int | None = None,
+    reporter: ProgressReporter | None = None,
+) -> dict:
+    """Long cook on the island-model genetic solver, one island per pool worker.
+
+    Islands evolve independently for ``MIGRATION_INTERVAL`` seconds at a time;
+    between rounds each island's best tour migrates to the next island in a
+    ring, replacing its worst member. A stored or carried-over route seeds
+    every island. ``islands`` is capped at ``max_workers`` so all of them
+    evolve at once and each round keeps to its share of ``time_limit``.
+    """
+    islands = max(1, min(islands or max_workers, max_workers))
+    if len(coords) <= EXACT_MAX_POINTS:
+        return await run_in_cook_pool(
+            max_workers, cook_route, coords, time_limit, None, None, store, scope, reporter
+        )
+
+    plan = await run_in_cook_pool(max_workers, prepare_cook, coords, time_limit, store, scope)
+    result = plan["result"]
+    if result is None:
+        started = time.perf_counter()
+        populations = [[plan["warm"]] if plan["warm"] else [] for _ in range(islands)]
+        round_count = max(1, round(time_limit / MIGRATION_INTERVAL))
+        generations = 0
+        stopped = False
+        runs = []
+        for round_index in range(round_count):
+            remaining = time_limit - (time.perf_counter() - started)
+            if remaining <= 0:
+                break
+            runs = await asyncio.gather(*(
+                run_in_cook_pool(
+                    max_workers,
+                    evolve_island,
+                    coords,
+                    min(time_limit / round_count, remaining),
+                    DEFAULT_SEED + round_index * islands + island,
+                    populations[island],
+                    reporter,
+                )
+                for island in range(islands)
+            ))
+            generations += sum(run["stats"]["rounds"] for run in runs)
+            populations = [run["population"] for run in runs]
+            if await asyncio.to_thread(_stop_requested, reporter):
+                stopped = True
+                break
+            if islands > 1:
+                for island, run in enumerate(runs):
+                    target = populations[(island + 1) % islands]
+                    target[-1] = run["population"][0]
+
+        best = min(runs, key=lambda run: run["cost"])
+        result = {"route": best["population"][0], "cost": best["cost"], "stats": best["stats"]}
+        result["stats"].update(
+            rounds=generations,
+            workers=islands,
+            stop_reason="stopped" if stopped else "finished",
+            converged=stopped,
+            elapsed=time.perf_counter() - started,
+            cache="warm" if plan["warm"] else "miss",
+        )
+
+    return await run_in_cook_pool(
+        max_workers, finish_cook, coords, result, time_limit, plan["cooked_for"], store, scope
+    )
+
+
+async def cook_route_batch(
+    max_workers: int,
+    groups: dict[str, list[tuple[float, float]]],
+    time_limit: float,
+    stall_window: float | None = None,
+    target_gap: float | None = None,
+    store: RouteStore | None = None,
+    scope: str | None = None,
+    reporter: ProgressReporter | None = None,
+) -> dict[str, dict]:
+    """Cook several point sets of one village side by side, one pool worker each.
+
+    ``groups`` maps a colour ("all" included) to its points; each route is
+    stored under ``{scope}/{colour}``. Largest sets are submitted first, and
+    with more sets than workers the budget is split into waves so the batch
+    still takes about ``time_limit``. Empty sets are left out of the result.
+    """
+    names = sorted((name for name, coords in groups.items() if coords), key=lambda name: -len(groups[name]))
+    waves = max(1, math.ceil(len(names) / max(1, max_workers)))
+    results = await asyncio.gather(*(
+        run_in_cook_pool(
+            max_workers,
+            cook_route,
+            groups[name],
+            time_limit / waves,
+            stall_window,
+            target_gap,
+            store,
+            f"{scope}/{name}" if scope is not None else None,
+            reporter,
+        )
+        for name in names
+    ))
+    return dict(zip(names, results))
+
+
+async def _run_in_pool(pool: ProcessPoolExecutor, fn, *args):
+    """Run ``fn`` in ``pool``; a dead worker replaces the pool and fails this call only."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, partial(fn, *args))
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+
+
+async def run_in_cook_pool(max_workers: int, fn, *args):
+    return await _run_in_pool(get_cook_pool(max_workers), fn, *args)
+
+
+async def run_in_precook_pool(fn, *args):
+    return await _run_in_pool(get_precook_pool(), fn, *args)
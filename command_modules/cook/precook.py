@@ -0,0 +1,115 @@
+#precook.py
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Callable
+
+from command_modules.cook.jobs import CookJobs
+from command_modules.cook.pool import cook_route, open_cook_channel, run_in_precook_pool
+from command_modules.cook.progress import ProgressReporter
+from command_modules.cook.route_store import RouteStore
+
+# Pearls land in bursts: a scope is pre-cooked once it has been quiet this long (seconds).
+PRECOOK_DELAY = 10.0
+# How often (seconds) the pre-cooker looks for idle time.
+IDLE_POLL_INTERVAL = 1.0
+# How often (seconds) a running pre-cook checks whether a /cook arrived.
+YIELD_POLL_INTERVAL = 0.25
+# The host counts as busy above this 1-minute load per CPU.
+BUSY_LOAD = 0.75
+
+
+def host_idle() -> bool:
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return True
+    return load < BUSY_LOAD * (os.cpu_count() or 1)
+
+
+class PreCooker:
+    """Re-cooks changed point sets in the background so the next /cook is a store hit.
+
+    ``mark`` queues a scope (``village/colour``, as used by ``RouteStore``)
+    with a loader for its current points. Scopes are cooked one at a time on
+    the low-priority pre-cook worker, only while ``jobs`` has no cook queued or
+    running and the host is not loaded. A cook that arrives meanwhile stops the
+    pre-cook at once; its partial route is kept and the scope is retried later.
+    """
+
+    def __init__(
+        self,
+        jobs: CookJobs,
+        store: RouteStore,
+        seconds: float,
+        stall_window: float | None = None,
+        target_gap: float | None = None,
+    ):
+        self.jobs = jobs
+        self.store = store
+        self.seconds = seconds
+        self.stall_window = stall_window
+        self.target_gap = target_gap
+        self.pending: dict[str, tuple[float, Callable[[], list[tuple[float, float]]]]] = {}
+        self.task: asyncio.Task | None = None
+
+    def mark(self, scope: str, load: Callable[[], list[tuple[float, float]]]) -> None:
+        """Pre-cook ``scope`` once it has been quiet for ``PRECOOK_DELAY`` seconds."""
+        if self.seconds <= 0:
+            return
+        self.pending[scope] = (time.monotonic(), load)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def busy(self) -> bool:
+        return bool(self.jobs.jobs)
+
+    async def _run(self) -> None:
+        while self.pending:
+            await asyncio.sleep(IDLE_POLL_INTERVAL)
+            if self.busy() or not host_idle():
+                continue
+            now = time.monotonic()
+            ready = [scope for scope, (marked, _) in self.pending.items() if now - marked >= PRECOOK_DELAY]
+            if not ready:
+                continue
+            scope = min(ready, key=lambda name: self.pending[name][0])
+            marked, load = self.pending.pop(scope)
+            try:
+                finished = await self._cook(scope, load)
+            except Exception as exc:
+                print(f"⚠️ Pre-cook failed for {scope}: {exc}")
+                continue
+            if not finished and scope not in self.pending:
+                self.pending[scope] = (marked, load)
+
+    async def _cook(self, scope: str, load: Callable[[], list[tuple[float, float]]]) -> bool:
+        """Cook ``scope`` once; False if a /cook interrupted it."""
+        coords = load()
+        if not coords:
+            return True
+        _, stop = await asyncio.to_thread(open_cook_channel)
+        solve = asyncio.ensure_future(run_in_precook_pool(
+            cook_route,
+            coords,
+            self.seconds,
+            self.stall_window,
+            self.target_gap,
+            self.store,
+            scope,
+            ProgressReporter(stop=stop),
+        ))
+        while not solve.done():
+            if self.busy():
+                await asyncio.to_thread(stop.set)
+                break
+            await asyncio.wait([solve], timeout=YIELD_POLL_INTERVAL)
+        result = await solve
+        stats = result["stats"]
+        print(
+            f"🍳 Pre-cooked {scope}: {result['cost']:,.2f} "
+            f"({stats.get('cache')}, {stats.get('stop_reason')})"
+        )
+        return stats.get("stop_reason") != "stopped"
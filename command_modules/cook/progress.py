@@ -0,0 +1,56 @@
+#progress.py
+from __future__ import annotations
+
+import time
+
+# Publish a new best tour at most this often (seconds) unless it is much shorter.
+REPORT_INTERVAL = 3.0
+# An improvement of at least this fraction is published straight away.
+REPORT_MIN_GAIN = 0.01
+# How often (seconds) the stop flag is read; it lives in another process.
+STOP_POLL_INTERVAL = 0.25
+
+
+class ProgressReporter:
+    """Streams improving tours from a solver worker to the bot, throttled.
+
+    ``queue`` and ``stop`` are ``multiprocessing.Manager`` proxies, so every
+    call is a round trip to the manager process; both are rate-limited here.
+    Messages are ``{"tag", "route", "cost"}`` dicts.
+    """
+
+    def __init__(self, queue=None, stop=None, tag: str | None = None):
+        self.queue = queue
+        self.stop = stop
+        self.tag = tag
+        self.last_cost = float("inf")
+        self.last_report = 0.0
+        self.last_poll = 0.0
+        self.stopped = False
+
+    def report(self, route: list[int], cost: float) -> None:
+        if self.queue is None or cost >= self.last_cost:
+            return
+        now = time.perf_counter()
+        if now - self.last_report < REPORT_INTERVAL and cost > self.last_cost * (1 - REPORT_MIN_GAIN):
+            return
+        self.last_cost = cost
+        self.last_report = now
+        try:
+            self.queue.put_nowait({"tag": self.tag, "route": list(route), "cost": cost})
+        except Exception as exc:
+            # The bot may have stopped listening; the solve itself must go on.
+            print(f"⚠️ Dropping cook progress: {exc}")
+            self.queue = None
+
+    def stop_requested(self) -> bool:
+        if self.stopped or self.stop is None:
+            return self.stopped
+        now = time.perf_counter()
+        if now - self.last_poll >= STOP_POLL_INTERVAL:
+            self.last_poll = now
+            try:
+                self.stopped = self.stop.is_set()
+            except Exception:
+                self.stop = None
+        return self.stopped
@@ -0,0 +1,195 @@
+#route_store.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+# Coordinates are rounded before hashing so float noise does not split entries.
+COORD_DECIMALS = 4
+
+
+def canonical_order(coords: list[tuple[float, float]]) -> list[int]:
+    """Input indices sorted by rounded position, the order routes are stored in."""
+    return sorted(
+        range(len(coords)),
+        key=lambda i: (round(coords[i][0], COORD_DECIMALS), round(coords[i][1], COORD_DECIMALS)),
+    )
+
+
+def point_set_key(coords: list[tuple[float, float]]) -> str:
+    """Hash of the point set, independent of input order and colour filtering."""
+    canonical = [
+        [round(coords[i][0], COORD_DECIMALS), round(coords[i][1], COORD_DECIMALS)]
+        for i in canonical_order(coords)
+    ]
+    payload = json.dumps(canonical, separators=(",", ":")).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class RouteStore:
+    """Best known route per point set, one JSON file per entry, evicted LRU by count and size.
+
+    Entry files live under ``<root>/<key[:2]>/<key>.json``; reads refresh the
+    file's mtime, which is what eviction orders by. The latest route per scope
+    (``remember``) is kept the same way and ages out with the rest.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.root = root
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def _scope_key(self, scope: str) -> str:
+        return "scope-" + hashlib.sha256(scope.encode()).hexdigest()
+
+    def _read(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"⚠️ Dropping unreadable cook route {path}: {exc}")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def get(self, coords: list[tuple[float, float]]) -> dict | None:
+        """Stored entry for ``coords`` with ``route`` mapped onto their input order."""
+        if not coords:
+            return None
+        entry = self._read(point_set_key(coords))
+        if entry is None:
+            return None
+        order = canonical_order(coords)
+        stored_route = entry.get("route", [])
+        if sorted(stored_route) != list(range(len(coords))):
+            return None
+        entry["route"] = [order[index] for index in stored_route]
+        return entry
+
+    def put(
+        self,
+        coords: list[tuple[float, float]],
+        route: list[int],
+        cost: float,
+        time_limit: float,
+        stats: dict,
+    ) -> bool:
+        """Store ``route`` unless an equal or shorter one is already known; returns True if written."""
+        if not coords:
+            return False
+        key = point_set_key(coords)
+        existing = self._read(key)
+        if existing is not None and existing.get("cost", float("inf")) <= cost + 1e-9:
+            # Remember that the point set has now been cooked for longer.
+            if time_limit <= existing.get("time_limit", 0):
+                return False
+            existing["time_limit"] = time_limit
+            existing["updated"] = time.time()
+            self._write(key, existing)
+            return False
+
+        order = canonical_order(coords)
+        rank = [0] * len(coords)
+        for canonical_index, input_index in enumerate(order):
+            rank[input_index] = canonical_index
+
+        entry = {
+            "key": key,
+            "points": len(coords),
+            "route": [rank[index] for index in route],
+            "cost": cost,
+            "time_limit": max(time_limit, existing.get("time_limit", 0) if existing else 0),
+            "solve_time": stats.get("elapsed"),
+            "solver_version": stats.get("solver_version"),
+            "strategy": stats.get("strategy"),
+            "optimal": bool(stats.get("optimal")),
+            "updated": time.time(),
+        }
+        self._write(key, entry)
+        self.evict()
+        return True
+
+    def latest(self, scope: str) -> dict | None:
+        """Last route cooked for ``scope`` (e.g. a village and colour), with its points."""
+        entry = self._read(self._scope_key(scope))
+        if entry is None or len(entry.get("coords", [])) != len(entry.get("route", [])):
+            return None
+        return entry
+
+    def remember(
+        self,
+        scope: str,
+        coords: list[tuple[float, float]],
+        route: list[int],
+        cost: float,
+        time_limit: float,
+    ) -> None:
+        """Record ``route`` as the latest one for ``scope`` so the next cook can repair it."""
+        if not coords:
+            return
+        entry = {
+            "scope": scope,
+            "coords": [list(point) for point in coords],
+            "route": route,
+            "cost": cost,
+            "time_limit": time_limit,
+            "updated": time.time(),
+        }
+        self._write(self._scope_key(scope), entry)
+
+    def _write(self, key: str, entry: dict) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump(entry, file, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self) -> int:
+        """Drop least recently used entries until both limits hold; returns how many were removed."""
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        files.sort()
+        total_bytes = sum(size for _, size, _ in files)
+        removed = 0
+        while files and (len(files) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = files.pop(0)
+            self._remove(path)
+            total_bytes -= size
+            removed += 1
+        return removed
@@ -0,0 +1,358 @@
+#solver.py
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import Callable
+
+from command_modules.cook.convergence import (
+    BOUND_MAX_POINTS,
+    BOUND_SHARE,
+    ConvergenceMonitor,
+    default_stall_window,
+    held_karp_bound,
+)
+from command_modules.cook.construction import cheapest_insertion, greedy_edge, nearest_neighbor
+from command_modules.cook.exact import EXACT_MAX_POINTS, held_karp
+from command_modules.cook.geometry import Geometry
+from command_modules.cook.lin_kernighan import iterated_lin_kernighan
+from command_modules.cook.local_search import improve_route, reverse_segment
+from command_modules.cook.progress import ProgressReporter
+
+SOLVER_VERSION = 10
+
+# "auto" policy: (strategy, max points, max seconds per point), first match wins.
+# Calibrated with ``python -m command_modules.cook.benchmark``.
+POLICY = (
+    ("restarts", 20, float("inf")),
+    ("lk", 600, float("inf")),
+)
+POLICY_FALLBACK = "lk"
+
+# Share of the budget spent on local-search restarts before annealing the best tour.
+RESTART_SHARE = 0.5
+# Share of the budget kept back to polish the annealed tour with local search.
+POLISH_SHARE = 0.05
+# Cheapest insertion is cubic, so it only seeds small instances.
+INSERTION_MAX_POINTS = 150
+
+# Temperatures are scaled by the average edge of the starting tour.
+SA_START_FACTOR = 0.3
+SA_END_FACTOR = 0.002
+SA_CLOCK_MASK = 0x3FF
+DEFAULT_SEED = 42
+
+
+def simulated_annealing(
+    geo: Geometry,
+    route: list[int],
+    rng: random.Random,
+    deadline: float,
+    time_up=None,
+    on_improve=None,
+) -> list[int]:
+    """Anneal ``route`` until ``deadline`` using 2-opt and swap moves scored from their end edges.
+
+    ``time_up`` can end the run before ``deadline``; ``on_improve`` receives each new best cost and tour.
+    """
+    count = len(route)
+    if count < 5:
+        return route
+
+    route = route[:]
+    dist = geo.dist
+
+    current_cost = geo.cost(route)
+    best = route[:]
+    best_cost = current_cost
+    at_best = False
+
+    started = time.perf_counter()
+    span = max(deadline - started, 1e-3)
+    temp_start = SA_START_FACTOR * current_cost / count
+    temp_end = SA_END_FACTOR * current_cost / count
+    if temp_start <= 0:
+        # Every point coincides: every tour is already optimal.
+        return route
+    temperature = temp_start
+
+    randrange = rng.randrange
+    random_unit = rng.random
+    exp = math.exp
+    last = count - 1
+    iteration = 0
+
+    while True:
+        iteration += 1
+        if not iteration & SA_CLOCK_MASK:
+            now = time.perf_counter()
+            if now > deadline or (time_up is not None and time_up()):
+                break
+            progress = (now - started) / span
+            temperature = temp_start * (temp_end / temp_start) ** progress
+
+        i = randrange(count)
+        j = randrange(count)
+        if i == j:
+            continue
+        if i > j:
+            i, j = j, i
+
+        if random_unit() < 0.5:
+            if i == 0 and j == last:
+                continue
+            prev_node = route[i - 1]
+            next_node = route[j + 1] if j < last else route[0]
+            first = route[i]
+            second = route[j]
+            delta = (
+                dist[prev_node][second] + dist[first][next_node]
+                - dist[prev_node][first] - dist[second][next_node]
+            )
+            is_swap = False
+        else:
+            a = route[i]
+            b = route[j]
+            row_a = dist[a]
+            row_b = dist[b]
+            if j == i + 1:
+                prev_a = route[i - 1]
+                next_b = route[j + 1] if j < last else route[0]
+                delta = row_b[prev_a] + row_a[next_b] - row_a[prev_a] - row_b[next_b]
+            elif i == 0 and j == last:
+                prev_b = route[j - 1]
+                next_a = route[1]
+                delta = row_a[prev_b] + row_b[next_a] - row_b[prev_b] - row_a[next_a]
+            else:
+                prev_a = route[i - 1]
+                next_a = route[i + 1]
+                prev_b = route[j - 1]
+                next_b = route[j + 1] if j < last else route[0]
+                delta = (
+                    row_b[prev_a] + row_b[next_a] + row_a[prev_b] + row_a[next_b]
+                    - row_a[prev_a] - row_a[next_a] - row_b[prev_b] - row_b[next_b]
+                )
+            is_swap = True
+
+        if delta >= 0 and random_unit() >= exp(-delta / temperature):
+            continue
+
+        if delta >= 0 and at_best:
+            # Only snapshot the best tour when an uphill move is about to leave it.
+            best = route[:]
+            at_best = False
+
+        if is_swap:
+            route[i], route[j] = route[j], route[i]
+        else:
+            reverse_segment(route, i, j)
+        current_cost += delta
+
+        if current_cost < best_cost - 1e-9:
+            best_cost = current_cost
+            at_best = True
+            if on_improve is not None:
+                on_improve(best_cost, route)
+
+    if at_best:
+        best = route
+    return best
+
+
+class SolveState:
+    """Best tour, clocks and convergence monitor shared by the strategy running one solve."""
+
+    def __init__(
+        self,
+        geo: Geometry,
+        rng: random.Random,
+        monitor: ConvergenceMonitor,
+        started: float,
+        time_limit: float,
+    ):
+        self.geo = geo
+        self.rng = rng
+        self.monitor = monitor
+        self.started = started
+        self.time_limit = time_limit
+        self.deadline = monitor.deadline
+        self.best_route = list(range(geo.count))
+        self.best_cost = geo.cost(self.best_route)
+        self.rounds = 0
+        self.optimal = geo.count < 4
+        self.stop_reason: str | None = None
+
+    def time_up(self) -> bool:
+        return self.monitor.time_up()
+
+    def past_deadline(self) -> bool:
+        return time.perf_counter() > self.deadline
+
+    def consider(self, candidate: list[int]) -> None:
+        candidate_cost = self.geo.cost(candidate)
+        if candidate_cost < self.best_cost:
+            self.best_cost = candidate_cost
+            self.best_route = candidate
+            self.monitor.improved(candidate_cost, candidate)
+
+    def seed_tour(self, initial_route: list[int] | None, target_gap: float | None) -> None:
+        """Start from the warm route and a greedy tour, both locally optimised.
+
+        With a ``target_gap`` the Held-Karp lower bound is computed here too.
+        """
+        geo = self.geo
+        if initial_route is not None and sorted(initial_route) == list(range(geo.count)):
+            self.consider(improve_route(geo, initial_route, self.past_deadline))
+        self.consider(improve_route(geo, greedy_edge(geo), self.past_deadline))
+        self.rounds = 1
+
+        if target_gap is not None and geo.count <= BOUND_MAX_POINTS:
+            bound_until = self.started + self.time_limit * BOUND_SHARE
+            self.monitor.lower_bound = held_karp_bound(
+                geo, self.best_cost, lambda: time.perf_counter() > bound_until
+            )
+
+
+# name -> fn(state, initial_route, target_gap); see ``register_strategy``.
+STRATEGIES: dict[str, Callable[[SolveState, list[int] | None, float | None], None]] = {}
+
+
+def register_strategy(name: str):
+    """Make the decorated function selectable as ``solve_route(strategy=name)``."""
+    def decorator(fn):
+        STRATEGIES[name] = fn
+        return fn
+    return decorator
+
+
+@register_strategy("exact")
+def _exact_strategy(state: SolveState, initial_route, target_gap) -> None:
+    if state.geo.count > EXACT_MAX_POINTS:
+        raise ValueError(f"Exact cook is limited to {EXACT_MAX_POINTS} points, got {state.geo.count}")
+    state.consider(held_karp(state.geo))
+    state.optimal = True
+
+
+@register_strategy("local")
+def _local_strategy(state: SolveState, initial_route, target_gap) -> None:
+    """Greedy tour taken to a 2-opt/Or-opt local optimum, nothing more."""
+    state.seed_tour(initial_route, target_gap)
+    if not state.past_deadline():
+        state.stop_reason = "local_optimum"
+
+
+@register_strategy("restarts")
+def _restarts_strategy(state: SolveState, initial_route, target_gap) -> None:
+    """Local search from many starts, then anneal and polish the best tour."""
+    state.seed_tour(initial_route, target_gap)
+    geo = state.geo
+    rng = state.rng
+    time_limit = state.time_limit
+    restart_until = state.started + time_limit * RESTART_SHARE
+    if geo.count <= INSERTION_MAX_POINTS:
+        state.consider(improve_route(geo, cheapest_insertion(geo, state.time_up), state.time_up))
+
+    while time.perf_counter() < restart_until and not state.time_up():
+        start = rng.randrange(geo.count)
+        state.consider(improve_route(geo, nearest_neighbor(geo, start, state.time_up), state.time_up))
+        state.rounds += 1
+
+    polish_from = state.deadline - time_limit * POLISH_SHARE
+    annealed = simulated_annealing(
+        geo, state.best_route, rng, polish_from, state.time_up, state.monitor.improved
+    )
+    state.consider(improve_route(geo, annealed, state.past_deadline))
+
+
+@register_strategy("lk")
+def _lk_strategy(state: SolveState, initial_route, target_gap) -> None:
+    """Iterated Lin-Kernighan from the seeded tour."""
+    state.seed_tour(initial_route, target_gap)
+    state.consider(iterated_lin_kernighan(
+        state.geo, state.best_route, state.rng, state.time_up, state.monitor.improved
+    ))
+
+
+def choose_strategy(count: int, time_limit: float) -> str:
+    """Pipeline for ``count`` points and ``time_limit`` seconds, per ``POLICY``.
+
+    The first rule whose point and per-point budget limits both hold wins.
+    """
+    if count <= EXACT_MAX_POINTS:
+        return "exact"
+    budget = time_limit / max(1, count)
+    for strategy, max_points, max_budget in POLICY:
+        if count <= max_points and budget <= max_budget:
+            return strategy
+    return POLICY_FALLBACK
+
+
+def solve_route(
+    coords: list[tuple[float, float]],
+    time_limit: float,
+    seed: int = DEFAULT_SEED,
+    strategy: str = "auto",
+    stall_window: float | None = None,
+    target_gap: float | None = None,
+    initial_route: list[int] | None = None,
+    reporter: ProgressReporter | None = None,
+) -> dict:
+    """Find a short closed walk through ``coords`` within ``time_limit`` seconds.
+
+    ``strategy`` is one of ``STRATEGIES`` or ``"auto"`` (``choose_strategy``).
+    The solve stops early once the best tour has not improved for
+    ``stall_window`` seconds (default scales with the budget, ``0`` disables
+    it) or, when ``target_gap`` is given, once it is within that fraction of
+    the Held-Karp lower bound. A previous ``initial_route`` over the same
+    points warm-starts the search. ``reporter`` streams improving tours out
+    while the solve runs and can stop it early.
+
+    Returns a dict with ``route`` (indices into ``coords``), its ``cost`` and
+    solver ``stats``. ``stats["optimal"]`` marks provably shortest routes and
+    ``stats["converged"]`` any solve that stopped before the deadline.
+    """
+    if strategy != "auto" and strategy not in STRATEGIES:
+        raise ValueError(f"Unknown cook strategy: {strategy!r}")
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    deadline = started + max(0.0, time_limit)
+
+    if stall_window is None:
+        stall_window = default_stall_window(time_limit)
+    monitor = ConvergenceMonitor(
+        deadline, stall_window or None, target_gap=target_gap, reporter=reporter
+    )
+
+    geo = Geometry(coords)
+    count = geo.count
+    if strategy == "auto":
+        strategy = choose_strategy(count, time_limit)
+
+    state = SolveState(geo, rng, monitor, started, time_limit)
+    if not state.optimal:
+        STRATEGIES[strategy](state, initial_route, target_gap)
+
+    if state.optimal:
+        stop_reason = "optimal"
+    else:
+        monitor.time_up()
+        stop_reason = state.stop_reason or monitor.reason or "finished"
+
+    return {
+        "route": state.best_route,
+        "cost": state.best_cost,
+        "stats": {
+            "points": count,
+            "rounds": state.rounds,
+            "strategy": strategy,
+            "optimal": state.optimal,
+            "converged": state.optimal or stop_reason in ("stalled", "gap", "local_optimum", "stopped"),
+            "stop_reason": stop_reason,
+            "lower_bound": monitor.lower_bound,
+            "gap": monitor.gap(),
+            "elapsed": time.perf_counter() - started,
+            "solver_version": SOLVER_VERSION,
+        },
+    }
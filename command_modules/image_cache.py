@@ -0,0 +1,109 @@
+#image_cache.py
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+
+class ImageCache:
+    """In-memory LRU of rendered images, bounded by their total PNG bytes.
+
+    Entries are dicts holding at least ``png`` (bytes). Each one belongs to a
+    ``scope`` (a village) so everything rendered from that village's pearls can
+    be dropped in one indexed step. Entries older than ``ttl`` seconds count as
+    misses. ``hits``, ``misses`` and ``evictions`` are logged whenever the
+    byte budget forces entries out.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float | None = None):
+        self.max_bytes = max(0, max_bytes)
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.entries: OrderedDict[tuple, dict] = OrderedDict()
+        self.scopes: dict[str, set[tuple]] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> dict | None:
+        entry = self.peek(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def peek(self, key: tuple) -> dict | None:
+        """Like ``get`` without counting the lookup or refreshing recency."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry["stored_at"] > self.ttl:
+            self.pop(key)
+            return None
+        return entry
+
+    def put(self, key: tuple, scope: str, entry: dict) -> None:
+        """Store ``entry`` under ``key``, evicting least recently used entries past the budget."""
+        self.pop(key)
+        size = len(entry["png"])
+        if size > self.max_bytes:
+            return
+        entry["stored_at"] = time.monotonic()
+        entry["scope"] = scope
+        self.entries[key] = entry
+        self.scopes.setdefault(scope, set()).add(key)
+        self.total_bytes += size
+        evicted = 0
+        while self.total_bytes > self.max_bytes:
+            self.pop(next(iter(self.entries)))
+            evicted += 1
+        if evicted:
+            self.evictions += evicted
+            self.log_pressure(evicted)
+
+    def log_pressure(self, evicted: int) -> None:
+        stats = self.stats()
+        print(
+            f"🧹 Image cache full: evicted {evicted} image(s); "
+            f"{stats['entries']} cached in {stats['bytes'] / (1024 * 1024):.1f} MB, "
+            f"{stats['hits']} hits / {stats['misses']} misses, {stats['evictions']} evicted so far"
+        )
+
+    def pop(self, key: tuple) -> dict | None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.total_bytes -= len(entry["png"])
+        keys = self.scopes.get(entry["scope"])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.scopes[entry["scope"]]
+        return entry
+
+    def scoped(self, scope: str) -> list[tuple[tuple, dict]]:
+        """Live ``(key, entry)`` pairs of ``scope``, without touching recency."""
+        pairs = []
+        for key in list(self.scopes.get(scope, ())):
+            entry = self.peek(key)
+            if entry is not None:
+                pairs.append((key, entry))
+        return pairs
+
+    def invalidate(self, scope: str) -> int:
+        """Drop every entry of ``scope``; returns how many there were."""
+        keys = list(self.scopes.get(scope, ()))
+        for key in keys:
+            self.pop(key)
+        return len(keys)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -5,35 +5,71 @@ import xp
 
 #inder here
 import asyncio
-import subprocess
-import tempfile
 import json
-import os
 import io
 import hashlib
-import shutil
-import sys
+import queue
+import time
 #inder end
 
-from typing import Optional, List
+from concurrent.futures.process import BrokenProcessPool
+
+from typing import Awaitable, Callable, Optional, List
 from data import load_data, save_data
 from utils import get_point_data, get_point_user
-from views import ConfirmYesterdayView, UndoPointView
+from views import ConfirmYesterdayView, CookStopView, UndoPointView
 from collections import defaultdict
 from command_modules.pearldebt.ledger import add_pearls_owed
-temp_dir = tempfile.gettempdir()
-
-PLOT_CACHE: dict[str, dict] = {}
-COOK_CACHE: dict[tuple, dict] = {}
-
-COOKING: dict[str, dict] = {}
-COOK_ID = defaultdict(int)
+from command_modules.cook import (
+    DEEP_MIN_SECONDS,
+    CookJob,
+    CookJobs,
+    CookQueueFull,
+    PreCooker,
+    ProgressReporter,
+    RouteStore,
+    cook_route_batch,
+    cook_route_deep,
+    cook_route_parallel,
+    open_cook_channel,
+)
+from command_modules.cook.overlay import composite_route
+from command_modules.image_cache import ImageCache
+from command_modules.render_store import RenderStore, render_key
+
+ROUTE_STORE = RouteStore(
+    config.COOK_CACHE_DIR,
+    max_entries=config.COOK_CACHE_MAX_ENTRIES,
+    max_bytes=config.COOK_CACHE_MAX_MB * 1024 * 1024,
+)
+
+# Rendered /plot and /cook images, keyed ("plot", village) and ("cook", village, colour, seconds).
+IMAGE_CACHE = ImageCache(
+    config.IMAGE_CACHE_MAX_MB * 1024 * 1024,
+    ttl=config.IMAGE_CACHE_TTL_HOURS * 3600,
+)
+# The same images on disk, so they outlive restarts. Bump RENDER_VERSION when they change look.
+RENDER_STORE = RenderStore(config.RENDER_CACHE_DIR, max_bytes=config.RENDER_CACHE_MAX_MB * 1024 * 1024)
+RENDER_VERSION = 2
+
+COOK_JOBS = CookJobs(config.COOK_MAX_CONCURRENT, config.COOK_QUEUE_LIMIT)
+PRE_COOKER = PreCooker(
+    COOK_JOBS,
+    ROUTE_STORE,
+    config.COOK_PRECOOK_SECONDS,
+    config.COOK_STALL_SECONDS,
+    config.COOK_TARGET_GAP,
+)
 
 VILLAGE_ALIASES = {
     "capital": "An Bread Capital",
 }
 LAST_COOK_SECONDS: dict[tuple[str, str], int] = {}
 
+# Live route previews: at most one every PREVIEW_INTERVAL seconds unless PREVIEW_MIN_GAIN shorter.
+PREVIEW_INTERVAL = 3.0
+PREVIEW_MIN_GAIN = 0.01
+
 NEW_PEARL: dict[str, bool] = defaultdict(lambda: True)
 NEW_COLOR: dict[tuple[str, str], bool] = defaultdict(lambda: True)
 
@@ -141,11 +177,9 @@ async def handle_point(interaction: discord.Interaction, x: float, y: float, col
 
     LAST_COOK_SECONDS[(village, "all")] = 0
     LAST_COOK_SECONDS[(village, color.lower())] = 0
+    schedule_precook(village, color.lower(), refresh_data_cache)
 
-    PLOT_CACHE.pop(village, None)
-    for key in list(COOK_CACHE.keys()):
-        if key[0] == village:
-            del COOK_CACHE[key]
+    IMAGE_CACHE.invalidate(village)
 
     # ─────────────────────────────────────────
     # XP SYSTEM
@@ -211,23 +245,16 @@ async def handle_plot(interaction: discord.Interaction, village: str, deps: dict
     get_top_contributors = deps["get_top_contributors"]
     log_action = deps["log_action"]
 
-    cached = PLOT_CACHE.get(village)
+    current_hash = make_data_hash(refresh_data_cache().get(village, []))
+    cached = await cached_render(("plot", village), current_hash)
 
     if cached:
-        current_data = refresh_data_cache()
-        current_hash = make_data_hash(current_data.get(village, []))
-
-        if cached["hash"] == current_hash:
-            buf = cached["buf"]
-            embed = cached["embed"]
-            buf.seek(0)
-
-            await interaction.response.send_message(
-                embed=embed,
-                file=discord.File(buf, "map.png"),
-                ephemeral=True
-            )
-            return
+        await interaction.response.send_message(
+            embed=cached["embed"],
+            file=discord.File(io.BytesIO(cached["png"]), "map.png"),
+            ephemeral=True
+        )
+        return
     refresh_data_cache = deps["refresh_data_cache"]
     require_channel = deps["require_channel"]
     generate_plot = deps["generate_plot"]
@@ -275,12 +302,12 @@ async def handle_plot(interaction: discord.Interaction, village: str, deps: dict
     await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
 
     #inder here
-    PLOT_CACHE[village] = {
+    await store_render(("plot", village), {
         "count": len(current_data[village]),
         "hash": make_data_hash(current_data[village]),
-        "buf": buf,
+        "png": buf.getvalue(),
         "embed": embed
-    }
+    })
     #inder out
 
 async def handle_plot_detailed(interaction: discord.Interaction, village: str, deps: dict):
@@ -391,32 +418,41 @@ async def handle_undo(interaction: discord.Interaction, village: str, deps: dict
 
     points_with_indices.reverse()
 
+    def on_remove(removed) -> None:
+        # Runs once the chosen pearl is really gone, with that pearl's colour.
+        color = str(get_point_data(removed)[2]).lower()
+
+        NEW_PEARL[village] = True
+        NEW_COLOR[(village, color)] = True
+
+        LAST_COOK_SECONDS[(village, "all")] = 0
+        LAST_COOK_SECONDS[(village, color)] = 0
+        schedule_precook(village, color, deps["refresh_data_cache"])
+
+        IMAGE_CACHE.invalidate(village)
+
     view = UndoPointView(
         author_id=interaction.user.id,
         village=village,
         points_with_indices=points_with_indices,
-        is_admin=is_admin_channel
+        is_admin=is_admin_channel,
+        on_remove=on_remove,
     )
 
-    # IMPORTANT: attach deleted point AFTER selection, not placeholder
-    removed = points_with_indices[0][1]
-
-    color = get_point_data(removed)[2].lower()
-
-    NEW_PEARL[village] = True
-    NEW_COLOR[(village, color)] = True
-
-    LAST_COOK_SECONDS[(village, "all")] = 0
-    LAST_COOK_SECONDS[(village, color)] = 0
-
     await interaction.response.send_message(
         embed=view.get_embed(),
         view=view,
         ephemeral=True
     )
-async def handle_cook(interaction: discord.Interaction, color: str, village: str, seconds: int, deps: dict):
-    safe_village = village.strip() if village else "Dogville"
-    safe_village = safe_village.replace(" ", "_")
+async def handle_cook(
+    interaction: discord.Interaction,
+    color: str,
+    village: str,
+    seconds: int,
+    deps: dict,
+    deep: bool = False,
+    batch: bool = False,
+):
     await interaction.response.defer(ephemeral=True)
     village_raw = village.strip()
     village = normalize_village_input(village_raw, config.VILLAGE_OPTIONS)
@@ -426,15 +462,37 @@ async def handle_cook(interaction: discord.Interaction, color: str, village: str
     if not village:
         await interaction.edit_original_response(content="❌ Invalid village.")
         return
+    if deep and batch:
+        await interaction.edit_original_response(content="❌ Batch cooks cannot be deep.")
+        return
+    if deep and seconds <= DEEP_MIN_SECONDS:
+        await interaction.edit_original_response(
+            content=f"❌ Deep cooks need more than {DEEP_MIN_SECONDS}s."
+        )
+        return
+    if batch:
+        await handle_cook_batch(interaction, village, seconds, deps)
+        return
+    refresh_data_cache = deps["refresh_data_cache"]
+    require_channel = deps["require_channel"]
+    generate_plot = deps["generate_plot"]
+
+    if not await require_channel(
+        config.PLOT_CHANNEL_ID,
+        config.POINT_CHANNEL_ID
+    )(interaction):
+        return
+
     cook_scope = (village, color)
     last_cook = LAST_COOK_SECONDS.get(cook_scope, 0)
-    latest_cached = None
+    latest_cached = latest_cook(village, color)
 
-    for key, value in COOK_CACHE.items():
-        cached_village, cached_color, *_ = key
-        if cached_village != village: continue
-        if cached_color != color.lower(): continue
-        if (latest_cached is None or value.get("seconds", 0) > latest_cached.get("seconds", 0)): latest_cached = value
+    # IDENTICAL COOK ALREADY QUEUED OR RUNNING: SHARE ITS RESULT
+    signature = (village, color, make_data_hash(refresh_data_cache().get(village, [])), seconds, deep)
+    joined = COOK_JOBS.find(signature)
+    if joined is not None:
+        await follow_cook(interaction, village, joined)
+        return
 
     # lower/equal cook time requires new pearls
     if seconds <= last_cook:
@@ -456,25 +514,13 @@ async def handle_cook(interaction: discord.Interaction, color: str, village: str
                 )
             kwargs = {"content": message}
             if latest_cached:
-                old_buf = latest_cached["buf"]
-                old_embed = latest_cached["embed"]
-                old_buf.seek(0)
-                kwargs["embed"] = old_embed
-                kwargs["attachments"] = [discord.File(old_buf, "route.png")]
+                kwargs["embed"] = latest_cached["embed"]
+                kwargs["attachments"] = [cached_route_file(latest_cached)]
             await interaction.edit_original_response(**kwargs)
             return
-    refresh_data_cache = deps["refresh_data_cache"]
-    require_channel = deps["require_channel"]
-    generate_plot = deps["generate_plot"]
 
     current_data = refresh_data_cache()
 
-    if not await require_channel(
-        config.PLOT_CHANNEL_ID,
-        config.POINT_CHANNEL_ID
-    )(interaction):
-        return
-
     if village not in current_data or not current_data[village]:
         await interaction.edit_original_response(content="That village has no data.")
         return
@@ -487,7 +533,7 @@ async def handle_cook(interaction: discord.Interaction, color: str, village: str
     data = current_data.get(village, [])
     data_hash = make_data_hash(data)
 
-    cache_key = (village, color.lower(), seconds)
+    cache_key = ("cook", village, color.lower(), seconds)
 
     old_distance = None
 
@@ -495,222 +541,541 @@ async def handle_cook(interaction: discord.Interaction, color: str, village: str
         old_distance = latest_cached.get("distance")
 
     # EXACT CACHE HIT
-    cached = COOK_CACHE.get(cache_key)
-
-    if cached and cached.get("hash") == data_hash:
-        buf = cached["buf"]
-        embed = cached["embed"]
-
-        buf.seek(0)
+    cached = await cached_render(cache_key, data_hash)
 
+    if cached:
         await interaction.followup.send(
-            embed=embed,
-            file=discord.File(buf, "route.png"),
+            embed=cached["embed"],
+            file=cached_route_file(cached),
             ephemeral=True
         )
         return
 
     # SHOW OLD RESULT IMMEDIATELY WHILE NEW ONE COOKS
     if latest_cached:
-        old_buf = latest_cached["buf"]
-        old_embed = latest_cached["embed"]
-
-        old_buf.seek(0)
-
         await interaction.followup.send(
             content="♻️ Showing previous cook while generating updated route...",
-            embed=old_embed,
-            file=discord.File(old_buf, "route.png"),
+            embed=latest_cached["embed"],
+            file=cached_route_file(latest_cached),
             ephemeral=True
         )
 
-    COOK_ID[village] += 1
-    job_id = COOK_ID[village]
+    # Supersedes (and really stops) any cook still running for this village.
+    job = await start_cook_job(interaction, village, seconds, signature)
+    if job is None:
+        return
+
+    # The background stays in memory: concurrent cooks never share files.
+    buf_plot, _ = generate_plot(village,data,include_fake=True,user_id=interaction.user.id)
+    bg_png = buf_plot.getvalue()
+    old_distance = latest_cached.get("distance") if latest_cached else None
+
+    job.task = asyncio.create_task(_cook_worker(
+        interaction, village, color, seconds, deps, job, bg_png, data_hash, old_distance, deep
+    ))
+async def handle_cook_batch(interaction: discord.Interaction, village: str, seconds: int, deps: dict):
+    """Cook "all" and every colour with pearls in ``village`` as one job."""
+    refresh_data_cache = deps["refresh_data_cache"]
+    generate_plot = deps["generate_plot"]
+
+    if not await deps["require_channel"](
+        config.PLOT_CHANNEL_ID,
+        config.POINT_CHANNEL_ID
+    )(interaction):
+        return
 
-    existing = COOKING.get(village)
+    data = refresh_data_cache().get(village, [])
+    if not data:
+        await interaction.edit_original_response(content="That village has no data.")
+        return
+    data_hash = make_data_hash(data)
 
-    if isinstance(existing, dict):
-        existing["cancelled"] = True
+    signature = (village, "batch", data_hash, seconds)
+    joined = COOK_JOBS.find(signature)
+    if joined is not None:
+        await follow_cook(interaction, village, joined)
+        return
 
-        COOKING[village] = {
-            "job_id": job_id,
-            "seconds": seconds
-        }
-    elif existing is not None:
-        COOKING.pop(village, None)
+    job = await start_cook_job(interaction, village, seconds, signature, batch=True)
+    if job is None:
+        return
+    buf_plot, _ = generate_plot(village,data,include_fake=True,user_id=interaction.user.id)
+    job.task = asyncio.create_task(
+        _cook_batch_worker(interaction, village, seconds, deps, job, buf_plot.getvalue(), data_hash)
+    )
 
-    COOKING[village] = {"job_id": job_id,"seconds": seconds}
+async def start_cook_job(
+    interaction: discord.Interaction,
+    village: str,
+    seconds: int,
+    signature: tuple,
+    batch: bool = False,
+) -> Optional[CookJob]:
+    """Queue a cook and say so on the status message; None (user told) when the queue is full."""
+    try:
+        job = await COOK_JOBS.start(village, seconds, signature)
+    except CookQueueFull:
+        await interaction.edit_original_response(
+            content="❌ Too many cooks are queued right now. Try again in a minute."
+        )
+        return None
 
+    kind = "batch cook" if batch else "cook"
     await interaction.edit_original_response(
-        content=f"⏳ Starting cook for **{village}**... ({seconds}s)"
+        content=f"⏳ Starting {kind} for **{village}**... ({seconds}s)"
     )
+    return job
+
+def cook_status_callbacks(
+    interaction: discord.Interaction,
+    village: str,
+    seconds: int,
+    job: CookJob,
+    batch: bool = False,
+) -> tuple[Callable[..., Awaitable[None]], Callable[[int], Awaitable[None]]]:
+    """``update_status(stage, remaining=None)`` and ``show_position(position)`` for ``job``."""
+    title = "Batch cooking" if batch else "Cooking"
+
+    async def update_status(stage: str, remaining: Optional[int] = None) -> None:
+        if not COOK_JOBS.is_current(job):
+            return
+        msg = f"🚶 **{title} {village}**\n\nStatus: **{stage}**"
+        if remaining is not None:
+            msg += f"\n⏳ Time left: **{remaining}s / {seconds}s**"
+        await interaction.edit_original_response(content=msg)
 
-    buf_plot, _ = generate_plot(village,data,include_fake=True,user_id=interaction.user.id)
-    plot_path = os.path.join(temp_dir, f"{safe_village}_bg.png")
-    # IMPORTANT: force safe filename (NO SPACES ISSUES)
+    async def show_position(position: int) -> None:
+        if position:
+            await interaction.edit_original_response(
+                content=f"🕒 Queued to cook **{village}**: position **{position}**"
+            )
 
-    with open(plot_path, "wb") as f:
-        f.write(buf_plot.getvalue())
+    return update_status, show_position
 
-    bg_path = plot_path
-    old_distance = latest_cached.get("distance") if latest_cached else None
+async def _cook_batch_worker(
+    interaction: discord.Interaction,
+    village: str,
+    seconds: int,
+    deps: dict,
+    job: CookJob,
+    bg_png: bytes,
+    data_hash: str,
+) -> None:
+    update_status, show_position = cook_status_callbacks(interaction, village, seconds, job, batch=True)
 
-    asyncio.create_task(_cook_worker(interaction,village,safe_village,color,seconds,deps,job_id,plot_path,data_hash,old_distance))
-async def run_countdown(village, job_id, seconds, update_status):
-    state = COOKING.get(village)
-    if not state or state.get("job_id") != job_id or state.get("cancelled"):
+    try:
+        await COOK_JOBS.wait_turn(job, show_position)
+
+        # One read of the village feeds every colour.
+        points = deps["refresh_data_cache"]().get(village, [])
+        colors = ["all"] + sorted({str(get_point_data(point)[2]).lower() for point in points})
+        groups = {color: extract_route_coords(points, color) for color in colors}
+
+        _, stop = await asyncio.to_thread(open_cook_channel)
+        job.attach_stop(stop)
+        solve_task = asyncio.create_task(cook_route_batch(
+            config.COOK_WORKERS,
+            groups,
+            seconds,
+            config.COOK_STALL_SECONDS,
+            config.COOK_TARGET_GAP,
+            ROUTE_STORE,
+            village,
+            ProgressReporter(stop=stop),
+        ))
+        await interaction.edit_original_response(
+            view=CookStopView(
+                interaction.user.id,
+                lambda: asyncio.to_thread(stop.set),
+                lambda: job.cancel("cancelled by you"),
+            )
+        )
+        countdown_task = asyncio.create_task(
+            run_countdown(job, seconds, update_status)
+        )
+
+        try:
+            results = await solve_task
+        except Exception as exc:
+            print(f"⚠️ Batch cook failed for {village}: {exc}")
+            await interaction.edit_original_response(content=cook_failure_message(exc), view=None)
+            return
+        finally:
+            countdown_task.cancel()
+        await interaction.edit_original_response(view=None)
+        await update_status("Done")
+
+        routes = []
+        for color, result in sorted(results.items(), key=lambda item: colors.index(item[0])):
+            latest_cached = latest_cook(village, color)
+            old_distance = latest_cached.get("distance") if latest_cached else None
+            buf = await asyncio.to_thread(composite_route, bg_png, groups[color], result["route"])
+            embed = describe_cook(village, color, seconds, result, old_distance)
+            filename = f"route_{color}.png"
+            embed.set_image(url=f"attachment://{filename}")
+            await record_cook(village, color, seconds, data_hash, buf, embed, result["cost"], filename)
+            LAST_COOK_SECONDS[(village, color)] = seconds
+            routes.append((embed, filename, buf.getvalue()))
+        IMAGE_CACHE.pop(("plot", village))
+
+        if not job.outcome.done():
+            job.outcome.set_result(routes)
+        await send_routes(interaction, routes)
+
+    except asyncio.CancelledError:
+        await interaction.edit_original_response(
+            content=f"❌ Batch cook for **{village}** stopped: {job.reason or 'cancelled'}.",
+            view=None,
+        )
+        raise
+
+    finally:
+        COOK_JOBS.finish(job)
+
+async def follow_cook(interaction: discord.Interaction, village: str, job: CookJob) -> None:
+    """Wait for an identical cook someone else started and send its route here too."""
+    await interaction.edit_original_response(
+        content=f"🤝 The same cook for **{village}** is already on its way; you'll get its route."
+    )
+    try:
+        routes = await asyncio.shield(job.outcome)
+    except asyncio.CancelledError:
+        await interaction.edit_original_response(
+            content=f"❌ The cook you joined stopped: {job.reason or 'cancelled'}."
+        )
         return
+    await send_routes(interaction, routes)
+
+async def send_routes(
+    interaction: discord.Interaction, routes: list[tuple[discord.Embed, str, bytes]]
+) -> None:
+    """Send ``(embed, filename, png)`` routes, ten per message (Discord's embed limit)."""
+    for start in range(0, len(routes), 10):
+        page = routes[start:start + 10]
+        await interaction.followup.send(
+            embeds=[embed for embed, _, _ in page],
+            files=[discord.File(io.BytesIO(png), filename) for _, filename, png in page],
+            ephemeral=True
+        )
+
+async def run_countdown(
+    job: CookJob, seconds: int, update_status: Callable[..., Awaitable[None]]
+) -> None:
     for i in range(seconds):
-        state = COOKING.get(village)
-        if not state or state.get("job_id") != job_id or state.get("cancelled"):
+        if not COOK_JOBS.is_current(job):
             return
         await update_status("Cooking", seconds - i)
         await asyncio.sleep(1)
 
-async def _cook_worker(interaction, village, safe_village, color, seconds, deps, job_id, bg_path, data_hash, old_distance):
-    refresh_data_cache = deps["refresh_data_cache"]
-    cook_scope = (village, color.lower())
-    LAST_COOK_SECONDS[cook_scope] = seconds
-
-    cache_key = (village, color.lower(), seconds)
-
-    async def update_status(stage, remaining=None):
-        state = COOKING.get(village)
-        if not isinstance(state, dict) or state.get("job_id") != job_id or state.get("cancelled"):
+async def stream_previews(
+    interaction: discord.Interaction,
+    coords: list[tuple[float, float]],
+    bg_png: bytes,
+    progress: queue.Queue,
+    solve_task: asyncio.Task,
+    latest: dict,
+) -> None:
+    """Show streamed routes on the status message while ``solve_task`` runs.
+
+    ``latest`` keeps the best streamed route so a crashed solve still has an answer.
+    """
+    shown_cost = float("inf")
+    shown_at = 0.0
+    while not solve_task.done():
+        try:
+            message = await asyncio.to_thread(progress.get, True, 0.5)
+        except queue.Empty:
+            continue
+        except Exception:
             return
-        msg = f"🚶 **Cooking {village}**\n\nStatus: **{stage}**"
-        if remaining is not None:
-            msg += f"\n⏳ Time left: **{remaining}s / {seconds}s**"
-        await interaction.edit_original_response(content=msg)
+        if message["cost"] >= latest.get("cost", float("inf")):
+            continue
+        latest.update(message)
 
-    def run_render_sync(env, temp_dir, safe_village):
-        subprocess.run(
-            [sys.executable, "command_modules/tsp.py"],
-            cwd=os.getcwd(),
-            env=env,
-            check=True
+        now = time.monotonic()
+        if now - shown_at < PREVIEW_INTERVAL and message["cost"] > shown_cost * (1 - PREVIEW_MIN_GAIN):
+            continue
+        shown_cost = message["cost"]
+        shown_at = now
+        buf = await asyncio.to_thread(composite_route, bg_png, coords, message["route"])
+        if solve_task.done():
+            return
+        await interaction.edit_original_response(
+            attachments=[discord.File(buf, "preview.png")]
         )
-        return os.path.join(temp_dir, f"{safe_village}.png")
+
+async def _cook_worker(
+    interaction: discord.Interaction,
+    village: str,
+    color: str,
+    seconds: int,
+    deps: dict,
+    job: CookJob,
+    bg_png: bytes,
+    data_hash: str,
+    old_distance: Optional[float],
+    deep: bool = False,
+) -> None:
+    refresh_data_cache = deps["refresh_data_cache"]
+    cook_scope = (village, color.lower())
+    LAST_COOK_SECONDS[cook_scope] = seconds
+    update_status, show_position = cook_status_callbacks(interaction, village, seconds, job)
 
     try:
-        plot_path = os.path.join(temp_dir, f"{safe_village}_bg.png")
-        points_path = os.path.join(temp_dir, "points.json")
+        await COOK_JOBS.wait_turn(job, show_position)
 
         fresh_data = refresh_data_cache()
-        village_points = fresh_data.get(village, [])
-
-        with open(points_path, "w") as f:
-            json.dump({village: village_points}, f)
-
-        env = os.environ.copy()
-        env.update({
-            "INPUT": points_path,
-            "GROUP": village,
-            "OUTDIR": temp_dir,
-            "COLOR_MODE": color,
-            "SECONDS": str(seconds),
-            "TIME_LIMIT": str(seconds + 3),
-            "BG": os.path.abspath(bg_path),
-        })
+        coords = extract_route_coords(fresh_data.get(village, []), color)
+
+        progress, stop = await asyncio.to_thread(open_cook_channel)
+        job.attach_stop(stop)
+        reporter = ProgressReporter(progress, stop, tag=str(job.job_id))
 
         # 🚀 START BOTH IMMEDIATELY (NO DEPENDENCY)
-        render_task = asyncio.create_task(
-            asyncio.to_thread(run_render_sync, env, temp_dir, safe_village)
+        if deep:
+            solve = cook_route_deep(
+                config.COOK_WORKERS,
+                coords,
+                seconds,
+                ROUTE_STORE,
+                f"{village}/{color.lower()}",
+                config.COOK_PARALLEL_STARTS,
+                reporter,
+            )
+        else:
+            solve = cook_route_parallel(
+                config.COOK_WORKERS,
+                coords,
+                seconds,
+                config.COOK_STALL_SECONDS,
+                config.COOK_TARGET_GAP,
+                ROUTE_STORE,
+                f"{village}/{color.lower()}",
+                config.COOK_PARALLEL_STARTS,
+                reporter,
+            )
+        solve_task = asyncio.create_task(solve)
+
+        streamed = {}
+        preview_task = asyncio.create_task(
+            stream_previews(interaction, coords, bg_png, progress, solve_task, streamed)
+        )
+        await interaction.edit_original_response(
+            view=CookStopView(
+                interaction.user.id,
+                lambda: asyncio.to_thread(stop.set),
+                lambda: job.cancel("cancelled by you"),
+            )
         )
 
         countdown_task = asyncio.create_task(
-            run_countdown(village, job_id, seconds, update_status)
+            run_countdown(job, seconds, update_status)
         )
 
-        image_path = await render_task
-        await countdown_task
+        try:
+            result = await solve_task
+        except Exception as exc:
+            print(f"⚠️ Cook solve failed for {village} ({color}): {exc}")
+            if not streamed:
+                countdown_task.cancel()
+                await interaction.edit_original_response(
+                    content=cook_failure_message(exc), view=None
+                )
+                return
+            # Keep the best route the workers streamed before failing.
+            result = {
+                "route": streamed["route"],
+                "cost": streamed["cost"],
+                "stats": {"cache": "miss", "converged": False, "stop_reason": "interrupted"},
+            }
+
+        # Small or converged solves return early; the countdown should not outlive them.
+        countdown_task.cancel()
+        preview_task.cancel()
+        await interaction.edit_original_response(view=None, attachments=[])
+
+        distance = result["cost"]
+
+        stop_reason = result["stats"].get("stop_reason")
+        if stop_reason == "stopped":
+            await update_status("Stopped")
+        else:
+            await update_status("Converged" if result["stats"].get("converged") else "Done")
+        buf = await asyncio.to_thread(composite_route, bg_png, coords, result["route"])
+
+        embed = describe_cook(village, color, seconds, result, old_distance, deep)
+        embed.set_image(url="attachment://route.png")
 
-        distance_path = os.path.join(temp_dir, "distance.txt")
+        if not job.outcome.done():
+            job.outcome.set_result([(embed, "route.png", buf.getvalue())])
 
-        distance = None
+        await record_cook(village, color, seconds, data_hash, buf, embed, distance)
+        IMAGE_CACHE.pop(("plot", village))
 
-        if os.path.exists(distance_path):
-            with open(distance_path) as f:
-                try:
-                    distance = float(f.read().strip())
-                except:
-                    distance = None
+        await interaction.followup.send(
+            embed=embed,
+            file=discord.File(buf, "route.png"),
+            ephemeral=True
+        )
 
-        if not os.path.exists(image_path):
-            await interaction.edit_original_response(content="❌ Walk render failed.")
-            return
+    except asyncio.CancelledError:
+        await interaction.edit_original_response(
+            content=f"❌ Cook for **{village}** stopped: {job.reason or 'cancelled'}.",
+            view=None,
+            attachments=[],
+        )
+        raise
 
-        await update_status("Done")
-        from PIL import Image
-        import matplotlib.image as mpimg
-        base = Image.open(bg_path).convert("RGBA")
-        tsp = Image.open(image_path).convert("RGBA")
-        # Ensure both images are same size + RGBA before compositing
-        tsp = tsp.convert("RGBA")
-
-        if base.size != tsp.size:
-            tsp = tsp.resize(base.size, Image.Resampling.LANCZOS)
-
-        base = Image.alpha_composite(base.convert("RGBA"), tsp)
-        buf = io.BytesIO()
-        base.save(buf, format="PNG")
-        buf.seek(0)
-
-        improvement_text = ""
-        if (
-            old_distance is not None and
-            distance is not None
-        ):
-            diff = old_distance - distance
-
-            if diff > 0:
-                improvement_text = f"\n📉 Improved by `{diff:,.2f}`"
-            elif diff < 0:
-                improvement_text = f"\n📈 Worse by `{abs(diff):,.2f}`"
-            else:
-                improvement_text = "\n➖ Same distance"
+    finally:
+        COOK_JOBS.finish(job)
 
-        desc = f"Mode: {color} | Duration: {seconds}s"
+def cook_failure_message(exc: Exception) -> str:
+    if isinstance(exc, BrokenProcessPool):
+        return "❌ The cook worker crashed. It has been restarted; please try again."
+    return "❌ Walk render failed."
 
-        if distance is not None:
-            desc += f"\n📏 Distance: `{distance:,.2f}`"
+def latest_cook(village: str, color: str) -> Optional[dict]:
+    """Longest cached cook of ``village`` in ``color``, whatever its duration."""
+    latest_cached = None
+    for key, value in IMAGE_CACHE.scoped(village):
+        kind, _, cached_color, *_ = key
+        if kind != "cook": continue
+        if cached_color != color.lower(): continue
+        if (latest_cached is None or value.get("seconds", 0) > latest_cached.get("seconds", 0)): latest_cached = value
+    return latest_cached
 
-        desc += improvement_text
+async def cached_render(key: tuple, data_hash: str) -> Optional[dict]:
+    """Image rendered for ``key`` from ``data_hash``: memory first, then disk (promoted to memory)."""
+    entry = IMAGE_CACHE.get(key)
+    if entry is not None and entry.get("hash") == data_hash:
+        return entry
+    try:
+        entry = await asyncio.to_thread(RENDER_STORE.get, render_key(*key, data_hash, RENDER_VERSION))
+    except OSError as exc:
+        print(f"⚠️ Could not read rendered image {key}: {exc}")
+        return None
+    if entry is None:
+        return None
+    entry["embed"] = discord.Embed.from_dict(entry["embed"])
+    IMAGE_CACHE.put(key, key[1], entry)
+    return entry
 
-        embed = discord.Embed(
-            title=f"🚶 {village} Walk Simulation",
-            description=desc,
-            color=discord.Color.purple()
+async def store_render(key: tuple, entry: dict) -> None:
+    """Keep ``entry`` (``key[1]`` is its village) in memory and on disk."""
+    IMAGE_CACHE.put(key, key[1], entry)
+    try:
+        await asyncio.to_thread(
+            RENDER_STORE.put,
+            render_key(*key, entry["hash"], RENDER_VERSION),
+            {**entry, "embed": entry["embed"].to_dict()},
         )
-        embed.set_image(url="attachment://route.png")
+    except OSError as exc:
+        print(f"⚠️ Could not store rendered image {key}: {exc}")
+
+def cached_route_file(cached: dict) -> discord.File:
+    # The embed points at the attachment name the route was first sent under.
+    return discord.File(io.BytesIO(cached["png"]), cached.get("filename", "route.png"))
+
+async def record_cook(
+    village: str,
+    color: str,
+    seconds: int,
+    data_hash: str,
+    buf: io.BytesIO,
+    embed: discord.Embed,
+    distance: float,
+    filename: str = "route.png",
+) -> None:
+    """Cache a finished cook and mark the village's changes as consumed."""
+    # 🔥 cook consumed changes (before the disk write, so pearls added meanwhile still count)
+    if color == "all":
+        NEW_PEARL[village] = False
+    else:
+        NEW_COLOR[(village, color.lower())] = False
+
+    await store_render(("cook", village, color.lower(), seconds), {
+        "seconds": seconds,
+        "hash": data_hash,
+        "png": buf.getvalue(),
+        "filename": filename,
+        "embed": embed,
+        "distance": distance
+    })
+
+def describe_cook(
+    village: str,
+    color: str,
+    seconds: int,
+    result: dict,
+    old_distance: Optional[float],
+    deep: bool = False,
+) -> discord.Embed:
+    """Embed for a finished cook; the caller attaches the route image."""
+    distance = result["cost"]
+
+    improvement_text = ""
+    if (
+        old_distance is not None and
+        distance is not None
+    ):
+        diff = old_distance - distance
 
-        COOK_CACHE[cache_key] = {
-            "seconds": seconds,
-            "hash": data_hash,
-            "buf": buf,
-            "embed": embed,
-            "distance": distance
-        }
-
-        # 🔥 cook consumed changes
-        if color == "all":
-            NEW_PEARL[village] = False
+        if diff > 0:
+            improvement_text = f"\n📉 Improved by `{diff:,.2f}`"
+        elif diff < 0:
+            improvement_text = f"\n📈 Worse by `{abs(diff):,.2f}`"
         else:
-            NEW_COLOR[(village, color.lower())] = False
-        PLOT_CACHE.pop(village, None)
+            improvement_text = "\n➖ Same distance"
+
+    desc = f"Mode: {color} | Duration: {seconds}s"
+    if deep:
+        desc += " | Deep"
+
+    if distance is not None:
+        desc += f"\n📏 Distance: `{distance:,.2f}`"
+
+    desc += improvement_text
+
+    stats = result["stats"]
+    if stats.get("cache") == "hit":
+        desc += "\n⚡ Reused the best known route for these pearls"
+    elif stats.get("cache") == "repaired":
+        desc += "\n🩹 Patched the previous route for the changed pearls"
+    elif stats.get("stop_reason") == "interrupted":
+        desc += "\n⚠️ The cook was cut off; this is the best route it streamed"
+    elif stats.get("optimal"):
+        desc += "\n✅ Proven shortest route"
+    elif stats.get("stop_reason") == "stopped":
+        desc += f"\n⏹️ Stopped early after {stats['elapsed']:.1f}s"
+    elif stats.get("converged"):
+        desc += f"\n🎯 Converged after {stats['elapsed']:.1f}s"
+        if stats.get("gap") is not None:
+            desc += f" (within {stats['gap'] * 100:.2f}% of the lower bound)"
+
+    return discord.Embed(
+        title=f"🚶 {village} Walk Simulation",
+        description=desc,
+        color=discord.Color.purple()
+    )
 
-        await interaction.followup.send(
-            embed=embed,
-            file=discord.File(buf, "route.png"),
-            ephemeral=True
+def schedule_precook(village: str, color: str, refresh_data_cache) -> None:
+    """Re-cook ``village`` in idle time for "all" and the colour whose pearls changed."""
+    for scope_color in dict.fromkeys(("all", color)):
+        PRE_COOKER.mark(
+            f"{village}/{scope_color}",
+            lambda scope_color=scope_color: extract_route_coords(
+                refresh_data_cache().get(village, []), scope_color
+            ),
         )
 
-    finally:
-        state = COOKING.get(village)
-        if state and state.get("job_id") == job_id:
-            del COOKING[village]
-
-        shutil.rmtree(temp_dir, ignore_errors=True)
+def extract_route_coords(points: list, color: str) -> list[tuple[float, float]]:
+    coords = []
+    for point in points:
+        x, y, point_color = get_point_data(point)
+        if color != "all" and str(point_color).lower() != color:
+            continue
+        coords.append((float(x), float(y)))
+    return coords
 
 def make_data_hash(data):
     return hashlib.md5(
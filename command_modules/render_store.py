@@ -0,0 +1,115 @@
+#render_store.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def render_key(*parts) -> str:
+    """Hash of what an image was rendered from: kind, village, data hash, params, renderer version."""
+    payload = json.dumps(parts, separators=(",", ":"), default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class RenderStore:
+    """Rendered PNGs on disk so warm images survive restarts, evicted LRU by total size.
+
+    Each entry is ``<root>/<key[:2]>/<key>.png`` plus a ``.json`` sidecar with
+    its JSON-safe metadata. Reads refresh the PNG's mtime, which is what
+    eviction orders by. The total size is kept in memory after one scan of
+    ``root``, so writes only walk the directory when they push it past the
+    limit. Methods may be called from several threads.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        # PNG bytes on disk; None until the first write scans ``root``.
+        self.total_bytes: int | None = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.{ext}")
+
+    def get(self, key: str) -> dict | None:
+        """Metadata of ``key`` with its image under ``png``, or None."""
+        png_path = self._path(key, "png")
+        try:
+            with open(self._path(key, "json"), "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            with open(png_path, "rb") as file:
+                entry["png"] = file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"⚠️ Dropping unreadable rendered image {png_path}: {exc}")
+            self._remove(key)
+            return None
+        try:
+            os.utime(png_path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Store ``entry["png"]`` and the rest of ``entry`` (which must be JSON-safe) under ``key``."""
+        meta = {name: value for name, value in entry.items() if name != "png"}
+        png_path = self._path(key, "png")
+        try:
+            replaced = os.path.getsize(png_path)
+        except OSError:
+            replaced = 0
+        self._write(self._path(key, "json"), json.dumps(meta, separators=(",", ":")).encode())
+        self._write(png_path, entry["png"])
+        with self._lock:
+            if self.total_bytes is not None:
+                self.total_bytes += len(entry["png"]) - replaced
+                if self.total_bytes <= self.max_bytes:
+                    return
+            self._evict()
+
+    def _write(self, path: str, payload: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(payload)
+        os.replace(tmp, path)
+
+    def _remove(self, key: str) -> None:
+        for ext in ("png", "json"):
+            try:
+                os.remove(self._path(key, ext))
+            except OSError:
+                pass
+
+    def evict(self) -> int:
+        """Drop least recently used images until the size limit holds; returns how many were removed."""
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> int:
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith(".png"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, filename[:-4]))
+
+        files.sort()
+        total_bytes = sum(size for _, size, _ in files)
+        removed = 0
+        while files and total_bytes > self.max_bytes:
+            _, size, key = files.pop(0)
+            self._remove(key)
+            total_bytes -= size
+            removed += 1
+        self.total_bytes = total_bytes
+        return removed
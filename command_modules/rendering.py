@@ -9,8 +9,13 @@ import random
 import discord
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.font_manager import FontProperties
 from PIL import Image
 
+from command_modules.backgrounds import find_village_background, image_version, load_image
+
 import matplotlib as mpl
 
 mpl.rcParams.update({
@@ -520,6 +525,110 @@ def generate_chunk_plot(
     return buf, stats
 
 plt.close("all")
+
+
+class PointLabels(Artist):
+    """Black labels centred below their points, drawn as one artist.
+
+    Matches ``ax.text(x, y, label, ha="center", va="top")`` per label, without
+    the layout and bookkeeping of one ``Text`` artist each.
+    """
+
+    zorder = 3
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, labels: list[str], fontsize: float):
+        super().__init__()
+        self.offsets = np.column_stack([xs, ys])
+        self.labels = labels
+        self.prop = FontProperties(size=fontsize)
+        # Like ax.text, labels may spill past the axes (pearls near the bottom edge).
+        self.set_clip_on(False)
+
+    def draw(self, renderer) -> None:
+        if not self.get_visible() or not self.labels:
+            return
+        gc = renderer.new_gc()
+        gc.set_foreground("black")
+        # Public Artist/GraphicsContextBase clip API only; checked against matplotlib 3.8.4.
+        if self.get_clip_on():
+            clip_box = self.get_clip_box()
+            if clip_box is not None:
+                gc.set_clip_rectangle(clip_box)
+            clip_path = self.get_clip_path()
+            if clip_path is not None:
+                gc.set_clip_path(clip_path)
+        # Text boxes are at least one line ("lp") tall, as for Text.
+        _, line_height, line_descent = renderer.get_text_width_height_descent("lp", self.prop, ismath=False)
+        canvas_height = renderer.get_canvas_width_height()[1]
+        for (x, top), label in zip(self.axes.transData.transform(self.offsets), self.labels):
+            width, height, descent = renderer.get_text_width_height_descent(label, self.prop, ismath=False)
+            baseline = top - max(height, line_height) + max(descent, line_descent)
+            if renderer.flipy():
+                baseline = canvas_height - baseline
+            renderer.draw_text(gc, x - width / 2, baseline, label, self.prop, 0)
+        gc.restore()
+
+
+# /plot figures: the cached base layer and the per-request layer share this geometry.
+PLOT_FIGSIZE = (6, 6)
+PLOT_DPI = 100
+PLOT_EXTENT = [160, -160, -160, 160]
+
+# village -> ((background path, mtime), RGBA base layer)
+_BASE_LAYERS: dict[str, tuple[tuple, Image.Image]] = {}
+
+
+def _new_plot_axes():
+    fig, ax = plt.subplots(figsize=PLOT_FIGSIZE, dpi=PLOT_DPI)
+    ax.set_xlim(160, -160)
+    ax.set_ylim(-160, 160)
+    return fig, ax
+
+
+def _figure_to_image(fig, transparent: bool = False) -> Image.Image:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches=None, pad_inches=0.2, transparent=transparent)
+    plt.close(fig)
+    buf.seek(0)
+    return Image.open(buf).convert("RGBA")
+
+
+def render_base_layer(village: str, background: str | None) -> Image.Image:
+    """Everything on a village map that does not depend on its pearls."""
+    fig, ax = _new_plot_axes()
+    if background is None:
+        print(f"NO BACKGROUND FOUND for {village} in {os.getcwd()}")
+    else:
+        try:
+            # Pre-scaled to the axes box in pixels, so imshow maps it 1:1.
+            box = ax.get_window_extent()
+            image = load_image(background, (round(box.width), round(box.height)))
+            ax.imshow(image, extent=PLOT_EXTENT, zorder=0, interpolation="nearest")
+        except Exception as exc:
+            print(f"Image load failed for {village} at {background}: {exc}")
+
+    ax.set_title(f"Village: {village}")
+    ax.set_xlim(160, -160)
+    ax.set_ylim(-160, 160)
+    ax.set_xticks([x for x in range(160, -161, -20)])
+    ax.set_yticks([y for y in range(-160, 161, 20)])
+    ax.grid(True, linestyle="--", linewidth=0.5, color="gray", zorder=10)
+    ax.axhline(y=0, color="black", linewidth=1)
+    ax.axvline(x=0, color="black", linewidth=1)
+    return _figure_to_image(fig)
+
+
+def get_base_layer(village: str) -> Image.Image:
+    """Cached ``render_base_layer``; re-rendered when the background file changes."""
+    background = find_village_background(normalize_village_key(village))
+    version = image_version(background)
+    cached = _BASE_LAYERS.get(village)
+    if cached is None or cached[0] != version:
+        cached = (version, render_base_layer(village, background))
+        _BASE_LAYERS[village] = cached
+    return cached[1]
+
+
 def generate_plot(
     village: str,
     points: list,
@@ -529,60 +638,28 @@ def generate_plot(
     plot_colors: dict,
     color_options: list[str],
 ) -> tuple[io.BytesIO, tuple[int, int, str] | None]:
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.clear()
-
-    safe_village = normalize_village_key(village).strip().replace("__", "_")
-
-    cwd = os.getcwd()
-    print("LOOKING FOR VILLAGE IMAGE:", safe_village)
-    print("CWD:", cwd)
-
-    found = False
-    for ext in [".png", ".jpg", ".jpeg"]:
-        path = os.path.join(cwd, safe_village + ext)
-        print("TRY:", path)
-
-        if os.path.exists(path):
-            img = Image.open(path)
-            ax.imshow(img, extent=[160, -160, -160, 160], zorder=0)
-            found = True
-            break
-
-    if not found:
-        print("NO BACKGROUND FOUND")
-    for ext in [".png", ".jpg", ".jpeg"]:
-        path = os.path.join(os.getcwd(), f"{safe_village}{ext}")
-        if os.path.exists(path):
-            try:
-                print(f"Attempting to load: {path}")
-                print("LOOKING FOR:", os.path.abspath(path))
-                print("EXISTS:", os.path.exists(path))
-                img = Image.open(path)
-                ax.imshow(
-                    img,
-                    extent=[160, -160, -160, 160],
-                    zorder=0
-                )
-                break
-
-            except Exception as exc:
-                print(f"Image load failed for {village} at {path}: {exc}")
-                break
-
-    for point in points:
-        x, y, color = get_point_data_fn(point)
-        plot_color = plot_colors.get(color.lower(), color.lower())
-        ax.scatter(x, y, color=plot_color, s=50, edgecolors="black")
-        ax.text(x, y - 4, f"({int(x)}, {int(y)})", fontsize=10, color="black", ha="center", va="top")
+    """Village map: pearls, labels and the decoy pearl drawn over the cached base layer."""
+    fig, ax = _new_plot_axes()
+    ax.axis("off")
+
+    if points:
+        xs, ys, colors = zip(*(get_point_data_fn(point) for point in points))
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        plot_colors_list = [plot_colors.get(color.lower(), color.lower()) for color in colors]
+        ax.scatter(xs, ys, color=plot_colors_list, s=50, edgecolors="black")
+        ax.add_artist(PointLabels(
+            xs,
+            ys - 4,
+            [f"({int(x)}, {int(y)})" for x, y in zip(xs, ys)],
+            fontsize=10,
+        ))
 
     tsp_path = os.path.join(os.getcwd(), "route.png")
 
     if os.path.exists(tsp_path):
         try:
-            import matplotlib.image as mpimg
-
-            tsp_img = mpimg.imread(tsp_path)
+            tsp_img = load_image(tsp_path)
 
             ax.imshow(
                 tsp_img,
@@ -619,18 +696,10 @@ def generate_plot(
     else:
         return_info = None
 
-    ax.set_title(f"Village: {village}")
-    ax.set_xlim(160, -160)
-    ax.set_ylim(-160, 160)
-    ax.set_xticks([x for x in range(160, -161, -20)])
-    ax.set_yticks([y for y in range(-160, 161, 20)])
-    ax.grid(True, linestyle="--", linewidth=0.5, color="gray", zorder=10)
-    ax.axhline(y=0, color="black", linewidth=1)
-    ax.axvline(x=0, color="black", linewidth=1)
-
+    # Same axes box as the base layer, so the two line up pixel for pixel.
+    layer = _figure_to_image(fig, transparent=True)
+    image = Image.alpha_composite(get_base_layer(village), layer)
     buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches=None, pad_inches=0.2)
+    image.save(buf, format="PNG")
     buf.seek(0)
-    plt.close(fig)
-    plt.close(fig)
     return buf, return_info
@@ -18,6 +18,26 @@ def _require_int(name: str) -> int:
     except ValueError as exc:
         raise ValueError(f"Environment variable {name} must be an integer, got: {raw!r}") from exc
 
+
+def _optional_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw.strip())
+    except ValueError as exc:
+        raise ValueError(f"Environment variable {name} must be an integer, got: {raw!r}") from exc
+
+
+def _optional_float(name: str, default: float | None) -> float | None:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw.strip())
+    except ValueError as exc:
+        raise ValueError(f"Environment variable {name} must be a number, got: {raw!r}") from exc
+
 ADMIN_USER_IDS = [
     int(x)
     for x in os.getenv("ADMIN_USER_IDS", "").split(",")
@@ -34,6 +54,34 @@ PEARL_ROLE_ID = _require_int("PEARL_ROLE_ID")
 
 DATA_FILE = "points.json"
 
+# Worker processes kept alive for /cook route solving.
+COOK_WORKERS = _optional_int("COOK_WORKERS", max(1, (os.cpu_count() or 2) - 1))
+# Independent solves one cook fans out over (1 = single process). More than
+# COOK_WORKERS would queue inside the pool and stretch every round past its budget.
+COOK_PARALLEL_STARTS = min(_optional_int("COOK_PARALLEL_STARTS", COOK_WORKERS), COOK_WORKERS)
+# Cooks solving at the same time; further cooks wait in a FIFO queue of COOK_QUEUE_LIMIT.
+COOK_MAX_CONCURRENT = _optional_int(
+    "COOK_MAX_CONCURRENT", max(1, COOK_WORKERS // max(1, COOK_PARALLEL_STARTS))
+)
+COOK_QUEUE_LIMIT = _optional_int("COOK_QUEUE_LIMIT", 10)
+# Stop a cook once its best route has not improved for this many seconds
+# (unset = scale with the cook duration, 0 = never).
+COOK_STALL_SECONDS = _optional_float("COOK_STALL_SECONDS", None)
+# Stop a cook once its route is within this fraction of the proven lower bound.
+COOK_TARGET_GAP = _optional_float("COOK_TARGET_GAP", 0.005)
+# Villages with new pearls are re-cooked this long in idle time (0 = never).
+COOK_PRECOOK_SECONDS = _optional_int("COOK_PRECOOK_SECONDS", 30)
+# On-disk store of the best known route per point set.
+COOK_CACHE_DIR = os.getenv("COOK_CACHE_DIR", "cook_cache")
+COOK_CACHE_MAX_ENTRIES = _optional_int("COOK_CACHE_MAX_ENTRIES", 500)
+COOK_CACHE_MAX_MB = _optional_int("COOK_CACHE_MAX_MB", 50)
+# Rendered /plot and /cook images kept in memory, least recently used dropped first.
+IMAGE_CACHE_MAX_MB = _optional_int("IMAGE_CACHE_MAX_MB", 64)
+IMAGE_CACHE_TTL_HOURS = _optional_int("IMAGE_CACHE_TTL_HOURS", 24)
+# The same images on disk, so warm ones survive restarts.
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "render_cache")
+RENDER_CACHE_MAX_MB = _optional_int("RENDER_CACHE_MAX_MB", 200)
+
 # Village options - can be overridden via VILLAGES env var (comma-separated)
 DEFAULT_VILLAGES = [
     "Dogville",
@@ -73,12 +73,13 @@ class ConfirmClearView(ui.View):
 class UndoPointView(ui.View):
     """Interactive paginated view for selecting and removing points from a village."""
     
-    def __init__(self, author_id, village, points_with_indices, is_admin=False):
+    def __init__(self, author_id, village, points_with_indices, is_admin=False, on_remove=None):
         super().__init__(timeout=60)
         self.author_id = author_id
         self.village = village
         self.points_with_indices = points_with_indices  # List of (index, point) tuples
         self.is_admin = is_admin
+        self.on_remove = on_remove  # Called with the removed point once it is saved
         self.page = 0
         self.items_per_page = 5
         self.selected_index = None
@@ -170,6 +171,8 @@ class UndoPointView(ui.View):
                 if self.village in data and self.selected_index < len(data[self.village]):
                     removed_point = data[self.village].pop(self.selected_index)
                     save_data(data)
+                    if self.on_remove:
+                        self.on_remove(removed_point)
                     
                     # Deduct XP from the point owner
                     point_owner = get_point_user(removed_point)
@@ -301,3 +304,34 @@ class SampleModal(ui.Modal, title="Sample Form"):
             f"**Y Coordinate:** {y_coordinate}",
             ephemeral=True
         )
+
+
+class CookStopView(ui.View):
+    """Buttons shown while a /cook runs: stop and keep the best route so far, or cancel outright."""
+
+    def __init__(self, author_id, on_stop, on_cancel):
+        super().__init__(timeout=None)
+        self.author_id = author_id
+        self.on_stop = on_stop
+        self.on_cancel = on_cancel
+
+    @ui.button(label="⏹️ Stop here", style=discord.ButtonStyle.secondary)
+    async def stop_cook(self, interaction: Interaction, button: ui.Button):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ You didn't start this cook.", ephemeral=True)
+            return
+
+        button.disabled = True
+        await interaction.response.edit_message(view=self)
+        await self.on_stop()
+        self.stop()
+
+    @ui.button(label="❌ Cancel", style=discord.ButtonStyle.danger)
+    async def cancel_cook(self, interaction: Interaction, button: ui.Button):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ You didn't start this cook.", ephemeral=True)
+            return
+
+        await interaction.response.defer()
+        self.stop()
+        await self.on_cancel()